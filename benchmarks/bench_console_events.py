@@ -0,0 +1,121 @@
+"""Replay a CS2 console.log through the console event engine and report lines/sec.
+
+Usage:
+    python benchmarks/bench_console_events.py [path/to/console.log] [--repeat N]
+
+Without a path, a synthetic ~8 MB log (map loads, chat, networking noise and a
+few match-found / accept / disconnect lines) is generated in a temp dir.
+Compares the old per-line text scan against ConsoleLogReader with only
+match_found subscribed, with the events app.py subscribes and with every
+event subscribed.
+"""
+import argparse
+import os
+import pathlib
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from cs2.console_events import (  # noqa: E402
+    CONSOLE_EVENTS, MATCH_ACCEPTED, MATCH_CANCELLED, MATCH_FOUND, ConsolePatternSet,
+)
+from cs2.console_watcher import ConsoleLogReader  # noqa: E402
+
+NOISE = [
+    "[Client] CL:  CCSGO_BlurTarget::SetupBlurTarget",
+    "[SteamNetSockets] Ping measurement completed",
+    "[Networking] Sending packet, size {n}",
+    "[SoundSystem] Voice stream {n} started",
+    "[Panorama] Event MainMenu_PlayerList_Update fired",
+    "[Chat] Player{n}: gl hf",
+    "[Client] CheckServerReservation: 2 @ =[A:1:{n}:27015] (polling)",
+    "[Particles] Precached {n} particle systems",
+]
+EVENTS = [
+    "[Client] CheckServerReservation: 1 @ =[A:1:{n}:27015] (ok)",
+    "[Client] Connecting to =[A:1:{n}:27015]",
+    "[Client] CheckServerReservation: 1 @ =[A:1:{n}:27015] (failed)",
+    "[HostStateManager] Host activate: Loading (de_mirage)",
+    "Disconnect: NETWORK_DISCONNECT_DISCONNECT_BY_USER",
+]
+
+
+def generate_log(path: str, target_bytes: int = 8 * 1024 * 1024):
+    rng = random.Random(730)
+    with open(path, "w", encoding="utf-8", newline="\r\n") as f:
+        written = 0
+        while written < target_bytes:
+            template = rng.choice(EVENTS) if rng.random() < 0.001 else rng.choice(NOISE)
+            line = "10/17 21:04:05 " + template.format(n=rng.randint(1, 99999)) + "\n"
+            f.write(line)
+            written += len(line) + 1
+
+
+def bench_legacy(path: str) -> int:
+    """The pre-reader tail loop: decode everything, splitlines, regex per line."""
+    regex = re.compile(CONSOLE_EVENTS[MATCH_FOUND][0])
+    hits = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f.read().splitlines():
+            line = line.strip()
+            if line and regex.search(line):
+                hits += 1
+    return hits
+
+
+def bench_reader(path: str, names) -> int:
+    patterns = ConsolePatternSet({name: CONSOLE_EVENTS[name] for name in names})
+    reader = ConsoleLogReader(path, patterns.prefilters, from_start=True)
+    hits = 0
+    try:
+        for line in reader.read_lines():
+            if patterns.match(line):
+                hits += 1
+    finally:
+        reader.close()
+    return hits
+
+
+def run(label, func, path, line_count, size, repeat):
+    best = float("inf")
+    hits = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = func(path)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {line_count / best:>14,.0f} lines/s {size / best / 1e6:>8.1f} MB/s  "
+          f"hits={hits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", nargs="?", help="Recorded console.log to replay")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.log
+        if not path:
+            path = os.path.join(tmp, "console.log")
+            generate_log(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        line_count = data.count(b"\n")
+        size = len(data)
+        print(f"{path}: {size / 1e6:.1f} MB, {line_count:,} lines")
+
+        run("legacy (match_found)", bench_legacy, path, line_count, size, args.repeat)
+        run("reader (match_found)", lambda p: bench_reader(p, [MATCH_FOUND]),
+            path, line_count, size, args.repeat)
+        run("reader (app's accept set)", lambda p: bench_reader(p, [MATCH_FOUND, MATCH_ACCEPTED, MATCH_CANCELLED]),
+            path, line_count, size, args.repeat)
+        run(f"reader (all {len(CONSOLE_EVENTS)} events)", lambda p: bench_reader(p, CONSOLE_EVENTS),
+            path, line_count, size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""End-to-end CS2 accept latency: match line written to console.log -> first click.
+
+Usage:
+    python benchmarks/bench_cs2_accept_latency.py [path/to/console.log]
+        [--matches N] [--rate LINES_PER_SEC] [--banner-ms MS]
+
+Appends console.log lines to a temp CS2 install at a steady rate (lines from
+a recorded log if one is given, synthetic noise otherwise) and writes a
+"CheckServerReservation: 1" line every so often. CS2ConsoleWatcher and
+CS2AutoAccept run unmodified against a fake game lifecycle, window, mouse
+and banner probe (the banner "renders" --banner-ms after the line), so this
+runs headless on Linux. Reported per match, from the moment the line was
+flushed:
+
+    detect    match_found callback fired
+    schedule  accept worker picked up the job
+    click     first click injected
+"""
+import argparse
+import logging
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from bench_console_events import NOISE  # noqa: E402
+from cs2 import CS2AutoAccept, CS2ConsoleWatcher  # noqa: E402
+from cs2.console_events import MATCH_ACCEPTED  # noqa: E402
+from game_lifecycle import GAME_WINDOWS, CS2, FakeLifecycleBackend, GameLifecycleMonitor  # noqa: E402
+
+STAGES = ("detect", "schedule", "click")
+CLIENT_AREA = (0, 0, 1920, 1080)
+
+
+class Harness:
+    """Fake window/mouse/probe backends that timestamp the current match."""
+
+    def __init__(self, banner_sec: float):
+        self.banner_sec = banner_sec
+        self.lock = threading.Lock()
+        self.session = None
+        self.written_at = 0.0
+        self.marks = {}
+        self.detected = threading.Event()
+        self.clicked = threading.Event()
+
+    def begin(self, session: str):
+        with self.lock:
+            self.session = session
+            self.written_at = time.perf_counter()
+            self.marks[session] = {}
+            self.detected.clear()
+            self.clicked.clear()
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        with self.lock:
+            marks = self.marks.get(self.session)
+            if marks is not None and stage not in marks:
+                marks[stage] = now - self.written_at
+        if stage == "click":
+            self.clicked.set()
+
+    # CS2ConsoleWatcher.register_callback
+    def on_match_found(self, _session_id):
+        self.mark("detect")
+        self.detected.set()
+
+    # Window backend
+    def find(self):
+        self.mark("schedule")
+        return 1
+
+    def focus(self, _hwnd, restore=False):
+        pass
+
+    def client_area(self, _hwnd):
+        return CLIENT_AREA
+
+    # Input backend
+    def click(self, _x, _y):
+        self.mark("click")
+
+    # Banner probe
+    def is_ready(self, *_args):
+        return time.perf_counter() - self.written_at >= self.banner_sec
+
+
+class Settings:
+    data = {"cs2_auto_accept_enabled": True}
+
+
+def noise_lines(log_path):
+    if not log_path:
+        rng = random.Random(730)
+        while True:
+            yield rng.choice(NOISE).format(n=rng.randint(1, 99999))
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        # Drop recorded matches so only ours are timed
+        lines = [line.rstrip("\r\n") for line in f if "CheckServerReservation: 1 @" not in line]
+    while True:
+        yield from lines
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", nargs="?", help="Recorded console.log to take background lines from")
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--rate", type=int, default=500, help="Background lines per second")
+    parser.add_argument("--gap", type=float, default=0.5, help="Seconds of background lines between matches")
+    parser.add_argument("--banner-ms", type=float, default=0.0,
+                        help="Delay before the fake banner probe reports the button")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    harness = Harness(args.banner_ms / 1000)
+    noise = noise_lines(args.log)
+    batch_interval = 0.01
+    batch = max(1, int(args.rate * batch_interval))
+
+    # The watcher may still hold console.log open on exit (matters on Windows)
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as cs2_path:
+        log_dir = os.path.join(cs2_path, "game", "csgo")
+        os.makedirs(log_dir)
+        log = open(os.path.join(log_dir, "console.log"), "ab", buffering=0)
+
+        def write(*lines):
+            stamp = time.strftime("%m/%d %H:%M:%S ")
+            log.write("".join(f"{stamp}{line}\r\n" for line in lines).encode())
+
+        def background(seconds):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                write(*(next(noise) for _ in range(batch)))
+                time.sleep(batch_interval)
+
+        backend = FakeLifecycleBackend()
+        lifecycle = GameLifecycleMonitor(backend=backend)
+        watcher = CS2ConsoleWatcher(lifecycle, cs2_path=cs2_path)
+        accept = CS2AutoAccept(Settings(), probe=harness, window=harness, mouse=harness)
+        watcher.register_callback(harness.on_match_found)
+        watcher.register_callback(accept.on_match_found)
+        watcher.register_event_callback(MATCH_ACCEPTED, accept.on_match_resolved)
+
+        lifecycle.start()
+        accept.start()
+        watcher.start()
+        backend.open_window(*GAME_WINDOWS[CS2])
+        try:
+            # The watcher tails from the end of the file; keep writing a
+            # warm-up match until it's picked up so timing starts with the
+            # tailer live
+            for attempt in range(100):
+                harness.begin(f"=[A:1:{attempt}:1]")
+                write(f"[Client] CheckServerReservation: 1 @ {harness.session} (ok)")
+                if harness.detected.wait(0.1):
+                    break
+            else:
+                sys.exit("Console watcher never picked up console.log")
+            write(f"[Client] Connecting to {harness.session}")
+
+            print(f"{args.matches} matches, {args.rate} background lines/s, banner after {args.banner_ms:g} ms")
+            for n in range(args.matches):
+                background(args.gap)
+                session = f"=[A:1:{1000000 + n}:27015]"
+                harness.begin(session)
+                write(f"[Client] CheckServerReservation: 1 @ {session} (ok)")
+                if not harness.clicked.wait(5.0):
+                    print(f"  {session}: no click within 5 s")
+                write(f"[Client] Connecting to {session}")
+        finally:
+            watcher.stop()
+            accept.stop()
+            lifecycle.stop()
+            log.close()
+
+    results = [marks for session, marks in harness.marks.items() if "27015" in session]
+    print(f"{'stage':<10} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}   (ms)")
+    for stage in STAGES:
+        values = [marks[stage] * 1000 for marks in results if stage in marks]
+        if not values:
+            print(f"{stage:<10} {'n/a':>9}")
+            continue
+        print(f"{stage:<10} {percentile(values, 50):>9.2f} {percentile(values, 90):>9.2f} "
+              f"{percentile(values, 99):>9.2f} {max(values):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
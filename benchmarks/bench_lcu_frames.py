@@ -0,0 +1,141 @@
+"""Benchmark routing LCU WebSocket frames to the app's handlers.
+
+Usage:
+    python benchmarks/bench_lcu_frames.py [frames.txt] [--frames N] [--repeat N]
+
+frames.txt holds one raw WebSocket text frame per line (as the client sent
+them); without one a synthetic firehose is generated: chat, presence,
+patcher and gameflow events around a champ select. Compares lcu-driver's
+path (json.loads every frame, then match its URI) with lol.lcu_frames
+(match the URI on the raw text, decode only frames a handler reads).
+"""
+import argparse
+import json
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from lcu_driver.events.responses import WebsocketEventResponse  # noqa: E402
+from lol.lcu_frames import JSON_BACKEND, EventRouter  # noqa: E402
+
+CHAMP_SELECT = '/lol-champ-select/v1/session'
+READY_CHECK = '/lol-matchmaking/v1/ready-check'
+# What LoLAutoAccept and LoLAutoPick register
+REGISTRATIONS = [
+    {'uri': CHAMP_SELECT, 'event_types': ('CREATE', 'UPDATE'), 'coroutine_or_callable': None},
+    {'uri': READY_CHECK, 'event_types': ('CREATE', 'UPDATE', 'DELETE'), 'coroutine_or_callable': None},
+]
+
+
+def frame(uri, data, event_type='Update'):
+    event = {'data': data, 'eventType': event_type, 'uri': uri}
+    return json.dumps([8, 'OnJsonApiEvent', event], separators=(',', ':'))
+
+
+def champ_select_session(rng):
+    def cell(cell_id):
+        return {'cellId': cell_id, 'championId': rng.randint(0, 900), 'assignedPosition': 'top',
+                'summonerId': rng.getrandbits(40), 'puuid': f'{rng.getrandbits(128):032x}',
+                'spell1Id': 4, 'spell2Id': 14, 'selectedSkinId': rng.randint(0, 90000),
+                'team': 1 if cell_id < 5 else 2, 'championPickIntent': 0, 'entitledFeatureType': ''}
+    actions = [[{'id': n * 10 + i, 'actorCellId': i, 'championId': rng.randint(0, 900), 'completed': n < 2,
+                 'isAllyAction': i < 5, 'isInProgress': n == 2, 'pickTurn': n, 'type': 'ban' if n < 2 else 'pick'}
+                for i in range(10)] for n in range(4)]
+    return {'actions': actions, 'myTeam': [cell(i) for i in range(5)], 'theirTeam': [cell(i) for i in range(5, 10)],
+            'localPlayerCellId': 2, 'gameId': rng.getrandbits(32), 'bans': {'myTeamBans': [], 'theirTeamBans': []},
+            'timer': {'adjustedTimeLeftInPhase': rng.randint(0, 30000), 'internalNowInEpochMs': 1760000000000,
+                      'isInfinite': False, 'phase': 'BAN_PICK', 'totalTimeInPhase': 30000},
+            'benchEnabled': False, 'chatDetails': {'multiUserChatId': f'{rng.getrandbits(64):x}'}}
+
+
+def synthetic_frames(count):
+    rng = random.Random(730)
+    frames = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.45:
+            friend = f'{rng.getrandbits(128):032x}@na1.pvp.net'
+            frames.append(frame(f'/lol-chat/v1/friends/{friend}', {
+                'availability': rng.choice(['chat', 'away', 'dnd']), 'gameName': f'friend{rng.randint(1, 500)}',
+                'lol': {'gameStatus': 'outOfGame', 'level': str(rng.randint(1, 500)), 'rankedLeagueTier': 'GOLD'},
+                'statusMessage': 'x' * rng.randint(0, 80), 'pid': friend}))
+        elif roll < 0.7:
+            frames.append(frame('/patcher/v1/products/league_of_legends/state', {
+                'action': 'Idle', 'isCorrupted': False, 'isUpToDate': True,
+                'components': [{'id': f'c{i}', 'progress': {'bytesComplete': rng.getrandbits(30)}} for i in range(8)]}))
+        elif roll < 0.85:
+            frames.append(frame(f'/lol-chat/v1/conversations/{rng.getrandbits(64):x}/messages',
+                                {'body': 'gl hf ' * rng.randint(1, 20), 'fromSummonerId': rng.getrandbits(40)},
+                                event_type='Create'))
+        elif roll < 0.88:
+            frames.append(frame('/lol-gameflow/v1/gameflow-phase', 'ChampSelect'))
+        elif roll < 0.9:
+            frames.append(frame(READY_CHECK, {'state': 'InProgress', 'timer': rng.random() * 10}))
+        else:
+            frames.append(frame(CHAMP_SELECT, champ_select_session(rng)))
+    return frames
+
+
+def run_legacy(frames):
+    matched = 0
+    for text in frames:
+        event = json.loads(text)[2]
+        for reg in REGISTRATIONS:
+            if reg['uri'] == event['uri'] and event['eventType'].upper() in reg['event_types']:
+                WebsocketEventResponse(event_type=event['eventType'], uri=event['uri'], data=event['data'])
+                matched += 1
+    return matched
+
+
+def run_router(frames, router):
+    matched = 0
+    for text in frames:
+        event = router.parse(text)
+        if event is not None:
+            for _ in router.handlers(event):
+                event.data  # the handler reads it
+                matched += 1
+    return matched
+
+
+def bench(fn, frames, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(frames)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", help="Recorded frames, one per line")
+    parser.add_argument("--frames", type=int, default=20000, help="Synthetic frames to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            frames = [line.rstrip("\r\n") for line in f if line.strip()]
+    else:
+        frames = synthetic_frames(args.frames)
+    subscribed = [text for text in frames if f'"uri":"{CHAMP_SELECT}"' in text or f'"uri":"{READY_CHECK}"' in text]
+    router = EventRouter(REGISTRATIONS)
+
+    print(f"{len(frames)} frames, {sum(map(len, frames)) / 1e6:.1f} MB; {len(subscribed)} for registered URIs; "
+          f"lazy decode with {JSON_BACKEND}")
+    print(f"{'corpus':<12} {'path':<10} {'frames/s':>12} {'matched':>8}")
+    for name, corpus in (("firehose", frames), ("subscribed", subscribed)):
+        if not corpus:
+            continue
+        for path, fn in (("legacy", run_legacy), ("router", lambda fs: run_router(fs, router))):
+            elapsed, matched = bench(fn, corpus, args.repeat)
+            print(f"{name:<12} {path:<10} {len(corpus) / elapsed:>12,.0f} {matched:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""End-to-end LoL latency against the mock LCU: event pushed -> REST call received.
+
+Usage:
+    python benchmarks/bench_lcu_latency.py [--rounds N] [--queue-sec SEC]
+
+Starts benchmarks/mock_lcu.py's MockLCU and connects SharedLCUConnector,
+LoLAutoAccept and LoLAutoPick to it unmodified (a fake game lifecycle
+reports the client window; the connector finds the mock through its
+lockfile). Each round enters the Matchmaking phase, waits --queue-sec,
+then pushes a ready check and a champ select session where it's our turn
+to pick. Reported per round, from the moment the frame was written:
+
+    accept      POST /lol-matchmaking/v1/ready-check/accept received
+    accept_rtt  the accept POST's round trip, as LoLAutoAccept measured it
+    hover       PATCH of our pick action (the auto-hover) received; the
+                pickable champions are pushed just before the session, as
+                the client does, so no fetch is needed
+"""
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from mock_lcu import CHAMP_SELECT, READY_CHECK, MockLCU, champ_select_session  # noqa: E402
+from game_lifecycle import GAME_WINDOWS, LOL_CLIENT, FakeLifecycleBackend, GameLifecycleMonitor  # noqa: E402
+from lol import LoLAutoAccept, LoLAutoPick, SharedLCUConnector  # noqa: E402
+from lol.lockfile import LockfileWatcher  # noqa: E402
+
+STAGES = ("accept", "accept_rtt", "hover")
+CHAMPION_ID = 103
+PICKABLE = list(range(1, 200))
+
+
+class Settings:
+    data = {
+        "auto_accept_enabled": True,
+        "auto_pick_enabled": True,
+        "auto_lock_enabled": False,
+        "default_champions": {"middle": {"primary": CHAMPION_ID}},
+    }
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def timed(lcu, method, path, push):
+    """Run ``push`` and return ms until ``method path`` reached the mock."""
+    since = len(lcu.requests)
+    start = time.perf_counter()
+    push()
+    request = lcu.wait_for_request(method, path, since=since)
+    return None if request is None else (request.received_at - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--queue-sec", type=float, default=0.05,
+                        help="Time in queue before each ready check (past 15 s, only a pre-warmed "
+                             "connection is still open)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lockfile = os.path.join(tmp, "lockfile")
+        lcu = MockLCU(lockfile)
+        lcu.start()
+
+        backend = FakeLifecycleBackend()
+        lifecycle = GameLifecycleMonitor(backend=backend)
+        connector = SharedLCUConnector(lifecycle, lockfile=LockfileWatcher([lockfile]))
+        auto_accept = LoLAutoAccept(Settings())
+        connector.register_handler(auto_accept)
+        connector.register_handler(LoLAutoPick(Settings()))
+        connector.register_phase_callback(auto_accept.on_gameflow_phase)
+        connected = threading.Event()
+        connector.register_ready_callback(lambda _: connected.set())
+
+        lifecycle.start()
+        connector.start()
+        started = time.perf_counter()
+        backend.open_window(*GAME_WINDOWS[LOL_CLIENT])
+        try:
+            if not connected.wait(10):
+                sys.exit("Connector never connected to the mock LCU")
+            while lcu.subscribers() == 0:
+                time.sleep(0.001)
+            print(f"client window -> subscribed: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+            results = {stage: [] for stage in STAGES}
+            hover_path = f"{CHAMP_SELECT}/actions/3"
+            for n in range(args.rounds):
+                lcu.gameflow_phase("Matchmaking")
+                time.sleep(args.queue_sec)
+                # Phases in the client's order: handlers subscribe by phase
+                lcu.gameflow_phase("ReadyCheck")
+                results["accept"].append(timed(lcu, "POST", f"{READY_CHECK}/accept", lcu.ready_check))
+                lcu.publish(READY_CHECK, event_type="Delete")
+                # The POST reached the mock; give the handler the response
+                time.sleep(0.005)
+                results["accept_rtt"].append(auto_accept.last_accept_rtt_ms)
+                auto_accept.last_accept_rtt_ms = None
+                lcu.gameflow_phase("ChampSelect")
+                results["hover"].append(timed(lcu, "PATCH", hover_path,
+                                              lambda: lcu.champ_select(champ_select_session(game_id=n + 1),
+                                                                       pickable=PICKABLE)))
+                lcu.publish(CHAMP_SELECT, event_type="Delete")
+        finally:
+            connector.stop()
+            lifecycle.stop()
+            lcu.stop()
+
+    print(f"{args.rounds} rounds")
+    print(f"{'stage':<10} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}   (ms)")
+    for stage in STAGES:
+        values = [v for v in results[stage] if v is not None]
+        missed = len(results[stage]) - len(values)
+        if not values:
+            print(f"{stage:<10} {'n/a':>9}")
+            continue
+        print(f"{stage:<10} {percentile(values, 50):>9.2f} {percentile(values, 90):>9.2f} "
+              f"{percentile(values, 99):>9.2f} {max(values):>9.2f}" + (f"   ({missed} missed)" if missed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark finding CS2's LaunchOptions in large synthetic localconfig.vdf files.
+
+Usage:
+    python benchmarks/bench_vdf.py [--apps N] [--friends N] [--repeat N]
+
+Compares the old approach (decode the file, then walk the 730 block one
+character at a time) with cs2.vdf.find() along LOCALCONFIG_APP_PATH (sibling
+subtrees skipped by regex) and a full cs2.vdf.parse().
+"""
+import argparse
+import pathlib
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from cs2 import vdf  # noqa: E402
+from cs2.localconfig_index import CS2_APP_ID, LOCALCONFIG_APP_PATH  # noqa: E402
+
+
+def generate_localconfig(apps: int, friends: int) -> bytes:
+    rng = random.Random(730)
+    out = ['"UserLocalConfigStore"\n{\n\t"friends"\n\t{\n']
+    for i in range(friends):
+        out.append(f'\t\t"{76561190000000000 + i}"\n\t\t{{\n'
+                   f'\t\t\t"name"\t\t"player {{{i}}} \\"nick\\""\n'
+                   f'\t\t\t"avatar"\t\t"{rng.getrandbits(160):040x}"\n'
+                   f'\t\t\t"NameHistory"\n\t\t\t{{\n\t\t\t\t"0"\t\t"old{i}"\n\t\t\t}}\n\t\t}}\n')
+    out.append('\t}\n\t"Software"\n\t{\n\t\t"Valve"\n\t\t{\n\t\t\t"Steam"\n\t\t\t{\n\t\t\t\t"apps"\n\t\t\t\t{\n')
+    app_ids = sorted({rng.randint(10, 3000000) for _ in range(apps)} | {int(CS2_APP_ID)}, key=str)
+    for app_id in app_ids:
+        out.append(f'\t\t\t\t\t"{app_id}"\n\t\t\t\t\t{{\n'
+                   f'\t\t\t\t\t\t"LastPlayed"\t\t"{rng.randint(1500000000, 1800000000)}"\n'
+                   f'\t\t\t\t\t\t"Playtime"\t\t"{rng.randint(0, 100000)}"\n'
+                   f'\t\t\t\t\t\t"cloud"\n\t\t\t\t\t\t{{\n\t\t\t\t\t\t\t"quota_bytes"\t\t"1000000"\n'
+                   f'\t\t\t\t\t\t}}\n')
+        if app_id == int(CS2_APP_ID):
+            out.append('\t\t\t\t\t\t"LaunchOptions"\t\t"-novid -condebug"\n')
+        out.append('\t\t\t\t\t}\n')
+    out.append('\t\t\t\t}\n\t\t\t}\n\t\t}\n\t}\n}\n')
+    return "".join(out).encode("utf-8")
+
+
+def legacy(data: bytes):
+    """The pre-parser _has_condebug: decode, then walk the 730 block char by char."""
+    content = data.decode("utf-8", errors="replace")
+    apps_idx = content.find('"apps"')
+    idx730 = content.find(f'"{CS2_APP_ID}"', apps_idx)
+    brace_open = content.find("{", idx730)
+    depth = 0
+    block_end = brace_open
+    for i in range(brace_open, len(content)):
+        if content[i] == "{":
+            depth += 1
+        elif content[i] == "}":
+            depth -= 1
+            if depth == 0:
+                block_end = i
+                break
+    m = re.search(r'"LaunchOptions"\s+"([^"]*)"', content[idx730:block_end])
+    return m.group(1) if m else None
+
+
+def skipping(data: bytes):
+    return vdf.find(data, LOCALCONFIG_APP_PATH).get("LaunchOptions").value
+
+
+def full(data: bytes):
+    return vdf.parse(data).find(*LOCALCONFIG_APP_PATH).get("LaunchOptions").value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=20000)
+    parser.add_argument("--friends", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    data = generate_localconfig(args.apps, args.friends)
+    print(f"localconfig.vdf: {len(data) / 1e6:.1f} MB, {args.apps} apps, {args.friends} friends")
+    for label, func in (("legacy char loop", legacy), ("vdf.find(path)", skipping), ("vdf.parse (full)", full)):
+        best = float("inf")
+        result = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = func(data)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<20} {best * 1000:>9.1f} ms {len(data) / best / 1e6:>8.1f} MB/s  LaunchOptions={result!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""A local stand-in for the League client's API (LCU), for driving lol/ off Windows.
+
+Usage:
+    python benchmarks/mock_lcu.py [--lockfile PATH] [--ready-check-every SEC]
+
+Serves HTTPS and the WAMP WebSocket on 127.0.0.1 with a throwaway
+self-signed certificate (made with the openssl CLI), and writes a lockfile
+pointing at itself, so SharedLCUConnector / LoLAutoAccept / LoLAutoPick and
+LCUApi connect to it as to the real client. Scripts push state with
+publish() (or gameflow_phase() / ready_check() / champ_select() /
+tick_timer()); every REST call
+is recorded and can be waited on with wait_for_request(). Like the client,
+a PATCH to a champ select action or a ready-check accept updates the
+resource and publishes the UPDATE.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from typing import NamedTuple
+
+from aiohttp import WSMsgType, web
+
+ALL_EVENTS_TOPIC = 'OnJsonApiEvent'
+READY_CHECK = '/lol-matchmaking/v1/ready-check'
+CHAMP_SELECT = '/lol-champ-select/v1/session'
+GAMEFLOW_PHASE = '/lol-gameflow/v1/gameflow-phase'
+PICKABLE_CHAMPIONS = '/lol-champ-select/v1/pickable-champion-ids'
+PASSWORD = 'mock-lcu'
+
+
+class RecordedRequest(NamedTuple):
+    method: str
+    path: str
+    body: object
+    received_at: float  # time.perf_counter()
+
+
+def champ_select_session(game_id, position='middle', local_cell_id=2, in_progress=True,
+                         champion_id=0, time_left_ms=30000):
+    """A minimal draft session: two completed bans, then our pick."""
+    bans = [{'id': 1, 'actorCellId': 0, 'championId': 1, 'completed': True, 'isInProgress': False, 'type': 'ban'},
+            {'id': 2, 'actorCellId': 5, 'championId': 2, 'completed': True, 'isInProgress': False, 'type': 'ban'}]
+    pick = {'id': 3, 'actorCellId': local_cell_id, 'championId': champion_id, 'completed': False,
+            'isInProgress': in_progress, 'type': 'pick'}
+    return {
+        'gameId': game_id,
+        'localPlayerCellId': local_cell_id,
+        'myTeam': [{'cellId': cell, 'assignedPosition': position if cell == local_cell_id else 'top',
+                    'championId': 0} for cell in range(5)],
+        'actions': [bans, [pick]],
+        'timer': {'phase': 'BAN_PICK', 'adjustedTimeLeftInPhase': time_left_ms, 'totalTimeInPhase': 30000,
+                  'internalNowInEpochMs': int(time.time() * 1000), 'isInfinite': False},
+    }
+
+
+def _make_certificate(directory):
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-keyout', key, '-out', cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+class MockLCU:
+    """The mock client. ``start()`` serves from a background thread; every
+    other method may be called from any thread."""
+
+    def __init__(self, lockfile_path, cert=None, key=None):
+        self.lockfile_path = lockfile_path
+        self._cert, self._key = cert, key
+        self._tmpdir = None
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self.port = None
+        self._resources = {}
+        self._sockets = {}  # WebSocketResponse -> subscribed topics
+        self._cond = threading.Condition()
+        self.requests = []
+
+    def start(self):
+        if not self._cert:
+            self._tmpdir = tempfile.TemporaryDirectory()
+            self._cert, self._key = _make_certificate(self._tmpdir.name)
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(started,), daemon=True)
+        self._thread.start()
+        started.wait()
+        with open(self.lockfile_path, 'w') as f:
+            f.write(f'LeagueClient:{os.getpid()}:{self.port}:{PASSWORD}:https')
+
+    def stop(self):
+        try:
+            os.remove(self.lockfile_path)
+        except OSError:
+            pass
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+        if self._tmpdir:
+            self._tmpdir.cleanup()
+
+    def _serve(self, started):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get('/', self._on_websocket)
+        app.router.add_route('*', '/{path:.*}', self._on_request)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(self._cert, self._key)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        self.port = sock.getsockname()[1]
+        self._loop.run_until_complete(web.SockSite(self._runner, sock, ssl_context=context).start())
+        started.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    # WebSocket
+
+    async def _on_websocket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets[ws] = set()
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                message = json.loads(msg.data)
+                if message[0] == 5:
+                    self._sockets[ws].add(message[1])
+                elif message[0] == 6:
+                    self._sockets[ws].discard(message[1])
+        finally:
+            del self._sockets[ws]
+        return ws
+
+    async def _send(self, uri, event_type, data):
+        specific = ALL_EVENTS_TOPIC + uri.replace('/', '_')
+        # Same key order as the client
+        event = {'data': data, 'eventType': event_type, 'uri': uri}
+        for ws, topics in list(self._sockets.items()):
+            for topic in (specific, ALL_EVENTS_TOPIC):
+                if topic in topics:
+                    await ws.send_str(json.dumps([8, topic, event], separators=(',', ':')))
+                    break
+
+    def publish(self, uri, data=None, event_type='Update'):
+        """Set (or, for 'Delete', remove) a resource and push the event to
+        subscribed WebSockets. Returns once the frames are written."""
+        with self._cond:
+            if event_type == 'Delete':
+                self._resources.pop(uri, None)
+            else:
+                self._resources[uri] = copy.deepcopy(data)
+        asyncio.run_coroutine_threadsafe(self._send(uri, event_type, data), self._loop).result(5)
+
+    def subscribers(self) -> int:
+        return sum(1 for topics in self._sockets.values() if topics)
+
+    # REST
+
+    async def _on_request(self, request):
+        body = None
+        if request.can_read_body:
+            text = await request.text()
+            body = json.loads(text) if text else None
+        path = request.path
+        with self._cond:
+            self.requests.append(RecordedRequest(request.method, path, body, time.perf_counter()))
+            self._cond.notify_all()
+
+        if request.method == 'GET':
+            if path == '/riotclient/region-locale':
+                return web.json_response({'locale': 'en_US', 'region': 'NA'})
+            with self._cond:
+                if path in self._resources:
+                    return web.json_response(self._resources[path])
+            return web.json_response({'httpStatus': 404, 'message': 'Not found'}, status=404)
+
+        if request.method == 'POST' and path == f'{READY_CHECK}/accept':
+            await self._update(READY_CHECK, lambda check: check.update(playerResponse='Accepted'))
+        elif request.method == 'PATCH' and path.startswith(f'{CHAMP_SELECT}/actions/'):
+            action_id = int(path.rsplit('/', 1)[1])
+
+            def apply(session):
+                for group in session['actions']:
+                    for action in group:
+                        if action['id'] == action_id:
+                            action.update(body or {})
+            await self._update(CHAMP_SELECT, apply)
+        return web.Response(status=204)
+
+    async def _update(self, uri, apply):
+        with self._cond:
+            data = self._resources.get(uri)
+            if data is None:
+                return
+            apply(data)
+            data = copy.deepcopy(data)
+        await self._send(uri, 'Update', data)
+
+    def wait_for_request(self, method, path, timeout=5.0, since=0) -> RecordedRequest | None:
+        """First recorded ``method path`` request at index >= ``since``."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for request in self.requests[since:]:
+                    if request.method == method and request.path == path:
+                        return request
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    # Scripted sequences
+
+    def gameflow_phase(self, phase):
+        self.publish(GAMEFLOW_PHASE, phase)
+
+    def ready_check(self):
+        self.publish(READY_CHECK, {'state': 'InProgress', 'playerResponse': 'None', 'timer': 0.0}, 'Create')
+
+    def champ_select(self, session, pickable=None):
+        """Start a champ select; ``pickable`` (champion ids) is served
+        before the session is pushed, as the client does."""
+        if pickable is not None:
+            self.publish(PICKABLE_CHAMPIONS, pickable, 'Create')
+        self.publish(CHAMP_SELECT, session, 'Create')
+
+    def tick_timer(self, time_left_ms):
+        """Republish the champ select session with a fresh timer."""
+        with self._cond:
+            session = copy.deepcopy(self._resources.get(CHAMP_SELECT))
+        if session is None:
+            return
+        session['timer'].update(adjustedTimeLeftInPhase=time_left_ms, internalNowInEpochMs=int(time.time() * 1000))
+        self.publish(CHAMP_SELECT, session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lockfile", default=os.path.join(tempfile.gettempdir(), "mock-lcu-lockfile"))
+    parser.add_argument("--ready-check-every", type=float, default=0,
+                        help="Seconds between scripted ready checks (0: none)")
+    args = parser.parse_args()
+
+    lcu = MockLCU(args.lockfile)
+    lcu.start()
+    print(f"Mock LCU on https://127.0.0.1:{lcu.port} (riot:{PASSWORD}), lockfile {args.lockfile}")
+    try:
+        while True:
+            if args.ready_check_every:
+                time.sleep(args.ready_check_every)
+                lcu.ready_check()
+                print("ready check")
+            else:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lcu.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ from ctypes import wintypes
 import winshell
 from win32com.client import Dispatch
 
-from settings import Settings, PROGRAM_NAME
+from settings import Settings, PROGRAM_NAME, CONFIG_DIR
 
 from brightness import (
     set_brightness_side_monitors, init_monitors_cache, get_all_monitor_serials,
@@ -29,8 +29,11 @@ from brightness import (
 )
 from vibrance import init_nvapi, set_vibrance, VibranceFocusConsumer
 from focus_monitor import FocusMonitor
+from game_lifecycle import GameLifecycleMonitor
 from lol import LoLAutoAccept, LoLAutoPick, SharedLCUConnector
 from cs2 import CS2AutoAccept, CS2ConsoleWatcher
+from cs2.console_events import MAP_LOADED, MATCH_ACCEPTED, MATCH_CANCELLED
+from cs2.gsi import GSI_DEFAULT_PORT
 from settings_window import SettingsWindow
 
 try:
@@ -94,7 +97,7 @@ def _enable_dark_menus_window(hwnd):
 
 
 class QOLApp:
-    def __init__(self):
+    def __init__(self, record_lcu=None):
         self.settings = Settings()
 
         # Update checker state (must be before create_tray_icon)
@@ -112,19 +115,32 @@ class QOLApp:
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
 
+        # One lifecycle monitor tells both game integrations when their game
+        # starts or stops
+        self.game_lifecycle = GameLifecycleMonitor()
+
         # Create shared LCU connector with handlers
         self.lol_auto_accept = LoLAutoAccept(self.settings)
         self.lol_auto_pick = LoLAutoPick(self.settings)
-        self.lcu_connector = SharedLCUConnector()
+        self.lcu_connector = SharedLCUConnector(self.game_lifecycle, record_path=record_lcu)
         self.lcu_connector.register_handler(self.lol_auto_accept)
         self.lcu_connector.register_handler(self.lol_auto_pick)
         self.lcu_connector.register_close_callback(lambda _: self.lol_auto_accept.on_disconnect())
         self.lcu_connector.register_close_callback(lambda _: self.lol_auto_pick.on_disconnect())
+        self.lcu_connector.register_phase_callback(self.lol_auto_accept.on_gameflow_phase)
 
         # Create CS2 console watcher with auto-accept handler
         self.cs2_auto_accept = CS2AutoAccept(self.settings)
-        self.cs2_watcher = CS2ConsoleWatcher()
+        self.cs2_watcher = CS2ConsoleWatcher(
+            self.game_lifecycle,
+            localconfig_cache_path=CONFIG_DIR / "cs2_localconfig_index.json",
+            gsi_port=GSI_DEFAULT_PORT if self.settings.data.get("cs2_gsi_enabled", False) else None,
+        )
         self.cs2_watcher.register_callback(self.cs2_auto_accept.on_match_found)
+        self.cs2_watcher.register_event_callback(MATCH_ACCEPTED, self.cs2_auto_accept.on_match_resolved)
+        self.cs2_watcher.register_event_callback(MATCH_CANCELLED, self.cs2_auto_accept.on_match_resolved)
+        # From GSI when enabled (earlier, no -condebug needed), else the console
+        self.cs2_watcher.register_event_callback(MAP_LOADED, self.cs2_auto_accept.on_map_loaded)
         self.cs2_watcher.register_condebug_missing_callback(self._on_condebug_missing)
 
         # Shared focus monitor: one daemon publishes the focused window;
@@ -436,6 +452,15 @@ class QOLApp:
             self.settings.data["cs2_auto_accept_enabled"] = not self.settings.data.get("cs2_auto_accept_enabled", True)
             self.settings.save_settings()
 
+        def check_cs2_gsi(_item):
+            return self.settings.data.get("cs2_gsi_enabled", False)
+
+        def toggle_cs2_gsi(_icon, _item):
+            enabled = not self.settings.data.get("cs2_gsi_enabled", False)
+            self.settings.data["cs2_gsi_enabled"] = enabled
+            self.settings.save_settings()
+            self.cs2_watcher.set_gsi_port(GSI_DEFAULT_PORT if enabled else None)
+
         def check_vibrance(_item):
             return self.settings.data.get("vibrance_enabled", False)
 
@@ -480,6 +505,11 @@ class QOLApp:
                 toggle_cs2_auto_accept,
                 checked=check_cs2_auto_accept
             ),
+            pystray.MenuItem(
+                "CS2 - Game State Integration",
+                toggle_cs2_gsi,
+                checked=check_cs2_gsi
+            ),
             pystray.MenuItem(
                 "Dimming",
                 toggle_dimming,
@@ -513,6 +543,8 @@ class QOLApp:
                     pass
             self.lcu_connector.stop()
             self.cs2_watcher.stop()
+            self.cs2_auto_accept.stop()
+            self.game_lifecycle.stop()
             self.brightness_consumer.stop()
             self.vibrance_consumer.stop()
             self.focus_monitor.stop()
@@ -527,7 +559,9 @@ class QOLApp:
                 set_vibrance(self.settings.data.get("vibrance_default_level", 50), vibrance_displays)
 
     def run(self):
+        self.game_lifecycle.start()
         self.lcu_connector.start()
+        self.cs2_auto_accept.start()
         self.cs2_watcher.start()
         self.focus_monitor.start()
         self.brightness_consumer.start()
@@ -1,15 +1,18 @@
+import ctypes
 import logging
+import sys
+import threading
 import time
-import ctypes
 from ctypes import wintypes
 from threading import Thread
 
-import win32api
-import win32con
+if sys.platform == "win32":
+    import win32api
+    import win32con
 
-logger = logging.getLogger(__name__)
+from .banner_probe import AcceptBannerProbe
 
-user32 = ctypes.windll.user32
+logger = logging.getLogger(__name__)
 
 CS2_WINDOW_TITLE = "Counter-Strike 2"
 # Safety net cooldown — only triggers if session_id is missing for some reason.
@@ -19,17 +22,95 @@ ACCEPT_COOLDOWN_SEC = 5.0
 ACCEPT_BUTTON_X_RATIO = 0.5
 ACCEPT_BUTTON_Y_RATIO = 0.42
 
+# Poll the button pixels this often until the banner shows, for at most the
+# fixed delay we used to sleep before clicking.
+BANNER_PROBE_INTERVAL_SEC = 0.05
+BANNER_TIMEOUT_SEC = 2.1
+
 # Click for ~3 seconds total to better catch the banner across UI transitions.
 CLICK_RETRIES = 6
 CLICK_RETRY_DELAY_SEC = 0.5
 
 
+class Win32Window:
+    """Finds, focuses and measures the CS2 window through user32."""
+
+    def find(self) -> int:
+        return ctypes.windll.user32.FindWindowW(None, CS2_WINDOW_TITLE)
+
+    def focus(self, hwnd, restore: bool = False):
+        user32 = ctypes.windll.user32
+        if restore:
+            SW_RESTORE = 9
+            user32.ShowWindow(hwnd, SW_RESTORE)
+        user32.SetForegroundWindow(hwnd)
+
+    def client_area(self, hwnd):
+        """(left, top, width, height) of the client area in screen coordinates."""
+        user32 = ctypes.windll.user32
+        rect = wintypes.RECT()
+        user32.GetClientRect(hwnd, ctypes.byref(rect))
+
+        point = wintypes.POINT(0, 0)
+        user32.ClientToScreen(hwnd, ctypes.byref(point))
+        return point.x, point.y, rect.right - rect.left, rect.bottom - rect.top
+
+
+class Win32Input:
+    """Injects real mouse clicks."""
+
+    def click(self, x: int, y: int):
+        win32api.SetCursorPos((x, y))
+        time.sleep(0.05)
+        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, x, y, 0, 0)
+        time.sleep(0.05)
+        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, x, y, 0, 0)
+
+
 class CS2AutoAccept:
-    def __init__(self, settings):
+    """Clicks CS2's accept button from one long-lived worker thread.
+
+    ``on_match_found`` only hands the session to the worker. A newer session
+    replaces one that is still being clicked, and ``on_match_resolved``
+    (everyone accepted, or the lobby was cancelled) stops the clicking if
+    it is about the session being accepted. ``on_map_loaded`` stops it
+    whatever the session: the match is under way.
+    Every handoff bumps ``_generation``; the worker's sleeps wake up as soon
+    as it changes, so a superseded or resolved accept never clicks again.
+
+    ``probe``, ``window`` and ``mouse`` default to the real Win32 backends;
+    pass fakes to drive it headless.
+    """
+
+    def __init__(self, settings, probe=None, window=None, mouse=None):
         self.settings = settings
+        self._probe = probe or AcceptBannerProbe()
+        self._window = window or Win32Window()
+        self._mouse = mouse or Win32Input()
         self._last_accept_time = 0.0
         self._last_session_id = None
 
+        self._cond = threading.Condition()
+        self._pending = None      # (session_id,) waiting for the worker
+        self._generation = 0      # bumped whenever the current accept is superseded
+        self._clicking = False    # worker is inside _accept_match
+        self._thread = None       # the current worker; any other one exits
+
+    def start(self):
+        with self._cond:
+            if self._thread:
+                return
+            self._thread = Thread(target=self._worker, daemon=True, name="cs2-auto-accept")
+            self._thread.start()
+
+    def stop(self):
+        # A worker from before a quick stop -> start sees it isn't current
+        # anymore and exits, instead of clicking next to the new one
+        with self._cond:
+            self._thread = None
+            self._generation += 1
+            self._cond.notify_all()
+
     def on_match_found(self, session_id=None):
         if not self.settings.data.get("cs2_auto_accept_enabled", True):
             logger.debug("CS2 match found but auto-accept is disabled")
@@ -40,57 +121,116 @@ class CS2AutoAccept:
             logger.debug(f"CS2 already accepted session {session_id}, skipping")
             return
 
-        # Secondary dedup: short time-based cooldown as a safety net.
+        # Secondary dedup: short time-based cooldown as a safety net when the
+        # session id is missing. A new session always replaces the current one.
         now = time.time()
-        if now - self._last_accept_time < ACCEPT_COOLDOWN_SEC:
+        if not session_id and now - self._last_accept_time < ACCEPT_COOLDOWN_SEC:
             logger.debug("CS2 accept cooldown active, skipping")
             return
 
         self._last_session_id = session_id
         self._last_accept_time = now
         logger.info(f"CS2 accepting match (session {session_id})")
-        Thread(target=self._accept_match, daemon=True).start()
-
-    def _accept_match(self):
-        # Wait for the accept banner to appear before clicking
-        time.sleep(1.5)
+        with self._cond:
+            self._pending = (session_id,)
+            self._generation += 1  # supersedes an accept still in progress
+            self._cond.notify_all()
+
+    def on_match_resolved(self, event):
+        """Console event callback for match_accepted / match_cancelled: the
+        banner is gone, so stop clicking. Ignored if it's about another
+        reservation than the one being accepted (e.g. a late line for the
+        previous lobby)."""
+        session_id = event.args[0] if event.args else None
+        if session_id and self._last_session_id and session_id != self._last_session_id:
+            logger.debug(f"CS2 {event.name} for {session_id}, not the session being accepted")
+            return
+        self._stop_clicking(event.name)
 
-        hwnd = user32.FindWindowW(None, CS2_WINDOW_TITLE)
+    def on_map_loaded(self, event):
+        """Console/GSI event callback for map_loaded: any accept still
+        pending or clicking is over, and the next banner starts afresh."""
+        self._last_session_id = None
+        self._last_accept_time = 0.0
+        self._stop_clicking(f"{event.name} {event.args[0]}")
+
+    def _stop_clicking(self, reason: str):
+        with self._cond:
+            if self._pending is None and not self._clicking:
+                return
+            self._pending = None
+            self._generation += 1
+            self._cond.notify_all()
+        logger.info(f"CS2 {reason}, stopping auto-accept clicks")
+
+    def _sleep(self, generation: int, seconds: float) -> bool:
+        """Sleep unless this accept is superseded first; returns True if it
+        is still current afterwards."""
+        with self._cond:
+            return not self._cond.wait_for(lambda: self._generation != generation, seconds)
+
+    def _worker(self):
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._thread is not me)
+                if self._thread is not me:
+                    return
+                session_id, = self._pending
+                self._pending = None
+                generation = self._generation
+                self._clicking = True
+            try:
+                self._accept_match(generation)
+            except Exception as e:
+                logger.error(f"Error in CS2 auto-accept for session {session_id}: {e}")
+            finally:
+                with self._cond:
+                    self._clicking = False
+
+    def _button_position(self, hwnd):
+        """Screen position of the accept button, plus the client area size."""
+        left, top, width, height = self._window.client_area(hwnd)
+        click_x = left + int(width * ACCEPT_BUTTON_X_RATIO)
+        click_y = top + int(height * ACCEPT_BUTTON_Y_RATIO)
+        return click_x, click_y, width, height
+
+    def _accept_match(self, generation: int):
+        hwnd = self._window.find()
         if not hwnd:
             logger.warning("CS2 window not found for auto-accept")
             return
 
-        SW_RESTORE = 9
-        user32.ShowWindow(hwnd, SW_RESTORE)
-        user32.SetForegroundWindow(hwnd)
-        time.sleep(0.6)
-
-        rect = wintypes.RECT()
-        user32.GetClientRect(hwnd, ctypes.byref(rect))
-
-        point = wintypes.POINT(0, 0)
-        user32.ClientToScreen(hwnd, ctypes.byref(point))
-
-        width = rect.right - rect.left
-        height = rect.bottom - rect.top
-
-        click_x = point.x + int(width * ACCEPT_BUTTON_X_RATIO)
-        click_y = point.y + int(height * ACCEPT_BUTTON_Y_RATIO)
+        self._window.focus(hwnd, restore=True)
+
+        # Wait for the accept banner to render (and CS2 to come to the front)
+        # by sampling the pixels under the button. If it never shows up —
+        # e.g. the capture can't see an exclusive-fullscreen frame — click
+        # after the old fixed delay anyway.
+        deadline = time.monotonic() + BANNER_TIMEOUT_SEC
+        start = time.monotonic()
+        while True:
+            click_x, click_y, width, height = self._button_position(hwnd)
+            if self._probe.is_ready(click_x, click_y, width, height):
+                logger.debug(f"CS2 accept banner detected after {time.monotonic() - start:.2f}s")
+                break
+            if time.monotonic() >= deadline:
+                logger.debug("CS2 accept banner not detected, clicking anyway")
+                break
+            if not self._sleep(generation, BANNER_PROBE_INTERVAL_SEC):
+                return
 
         # Click repeatedly across a ~3s window. Defensive against the banner
         # taking longer than expected to render or losing focus mid-attempt.
-        for _ in range(CLICK_RETRIES):
+        # Stops early once the match is accepted/cancelled or superseded.
+        clicks = 0
+        while clicks < CLICK_RETRIES:
             # Re-assert foreground each loop so the click lands on CS2 even if
             # the user briefly clicks elsewhere
-            user32.SetForegroundWindow(hwnd)
-            self._click_at(click_x, click_y)
-            time.sleep(CLICK_RETRY_DELAY_SEC)
-
-        logger.info(f"CS2 match auto-accepted (clicked {CLICK_RETRIES}x at {click_x}, {click_y})")
+            self._window.focus(hwnd)
+            self._mouse.click(click_x, click_y)
+            clicks += 1
+            if not self._sleep(generation, CLICK_RETRY_DELAY_SEC):
+                break
 
-    def _click_at(self, x: int, y: int):
-        win32api.SetCursorPos((x, y))
-        time.sleep(0.05)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, x, y, 0, 0)
-        time.sleep(0.05)
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, x, y, 0, 0)
+        logger.info(f"CS2 match auto-accept done (clicked {clicks}x at {click_x}, {click_y})")
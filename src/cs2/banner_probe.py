@@ -0,0 +1,147 @@
+import ctypes
+import logging
+from ctypes import wintypes
+
+logger = logging.getLogger(__name__)
+
+# Sampled box around the accept button centre, as a fraction of the client
+# area. The button is ~15% x 5% of the client area, so this stays inside it.
+PROBE_HALF_WIDTH_RATIO = 0.04
+PROBE_HALF_HEIGHT_RATIO = 0.01
+# Sample a PROBE_GRID x PROBE_GRID grid of pixels across the box
+PROBE_GRID = 3
+# The label is white on green, so a few samples may land on text
+MIN_GREEN_SAMPLES = 4
+
+# CS2's ACCEPT button is a saturated green (~#36B04A, brighter on hover).
+# Loose bounds so scaling, HDR and the hover highlight still match.
+MIN_GREEN = 100
+MIN_GREEN_MARGIN = 40
+
+
+def probe_box(center_x: int, center_y: int, client_width: int, client_height: int):
+    """Screen bbox (left, top, right, bottom) to capture around the button."""
+    half_w = max(2, int(client_width * PROBE_HALF_WIDTH_RATIO))
+    half_h = max(2, int(client_height * PROBE_HALF_HEIGHT_RATIO))
+    return (center_x - half_w, center_y - half_h, center_x + half_w + 1, center_y + half_h + 1)
+
+
+def _is_accept_green(pixel) -> bool:
+    r, g, b = pixel[:3]
+    return g >= MIN_GREEN and g - r >= MIN_GREEN_MARGIN and g - b >= MIN_GREEN_MARGIN
+
+
+def matches_accept_button(image) -> bool:
+    """True if enough grid samples of ``image`` (a PIL image of the probe box)
+    have the accept button's colour."""
+    width, height = image.size
+    if width < PROBE_GRID or height < PROBE_GRID:
+        return False
+    image = image.convert("RGB")
+    green = 0
+    for i in range(PROBE_GRID):
+        x = (2 * i + 1) * width // (2 * PROBE_GRID)
+        for j in range(PROBE_GRID):
+            y = (2 * j + 1) * height // (2 * PROBE_GRID)
+            if _is_accept_green(image.getpixel((x, y))):
+                green += 1
+    return green >= MIN_GREEN_SAMPLES
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+
+_gdi = None
+
+
+def _load_gdi():
+    """user32/gdi32 with handle-returning functions declared, so HDCs and
+    HBITMAPs aren't truncated to int on 64-bit Python."""
+    global _gdi
+    if _gdi is None:
+        user32 = ctypes.windll.user32
+        gdi32 = ctypes.windll.gdi32
+        user32.GetDC.restype = wintypes.HDC
+        user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        gdi32.CreateCompatibleDC.restype = wintypes.HDC
+        gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        gdi32.CreateCompatibleBitmap.restype = wintypes.HBITMAP
+        gdi32.CreateCompatibleBitmap.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int]
+        gdi32.SelectObject.restype = wintypes.HGDIOBJ
+        gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        gdi32.BitBlt.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                 wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+        gdi32.GetDIBits.argtypes = [wintypes.HDC, wintypes.HBITMAP, wintypes.UINT, wintypes.UINT,
+                                    ctypes.c_void_p, ctypes.c_void_p, wintypes.UINT]
+        gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        gdi32.DeleteDC.argtypes = [wintypes.HDC]
+        _gdi = (user32, gdi32)
+    return _gdi
+
+
+def _grab_screen(bbox):
+    """BitBlt only ``bbox`` off the screen. PIL's ImageGrab.grab(bbox=...)
+    captures every monitor and crops afterwards."""
+    from PIL import Image
+
+    user32, gdi32 = _load_gdi()
+    left, top, right, bottom = bbox
+    width, height = right - left, bottom - top
+    screen_dc = user32.GetDC(None)
+    mem_dc = gdi32.CreateCompatibleDC(screen_dc)
+    bitmap = gdi32.CreateCompatibleBitmap(screen_dc, width, height)
+    try:
+        old = gdi32.SelectObject(mem_dc, bitmap)
+        SRCCOPY = 0x00CC0020
+        copied = gdi32.BitBlt(mem_dc, 0, 0, width, height, screen_dc, left, top, SRCCOPY)
+        gdi32.SelectObject(mem_dc, old)
+        if not copied:
+            raise ctypes.WinError()
+
+        header = _BITMAPINFOHEADER(
+            biSize=ctypes.sizeof(_BITMAPINFOHEADER), biWidth=width,
+            biHeight=-height,  # negative: top-down rows
+            biPlanes=1, biBitCount=32, biCompression=0,  # BI_RGB
+        )
+        pixels = ctypes.create_string_buffer(width * height * 4)
+        DIB_RGB_COLORS = 0
+        if not gdi32.GetDIBits(mem_dc, bitmap, 0, height, pixels, ctypes.byref(header), DIB_RGB_COLORS):
+            raise ctypes.WinError()
+        return Image.frombuffer("RGB", (width, height), pixels.raw, "raw", "BGRX", 0, 1)
+    finally:
+        gdi32.DeleteObject(bitmap)
+        gdi32.DeleteDC(mem_dc)
+        user32.ReleaseDC(None, screen_dc)
+
+
+class AcceptBannerProbe:
+    """Checks whether CS2's ACCEPT button is on screen by capturing only the
+    few pixels around it. ``grab`` takes a bbox and returns a PIL image;
+    swap it out to probe synthetic images."""
+
+    def __init__(self, grab=None):
+        self._grab = grab or _grab_screen
+
+    def is_ready(self, center_x: int, center_y: int, client_width: int, client_height: int) -> bool:
+        bbox = probe_box(center_x, center_y, client_width, client_height)
+        try:
+            image = self._grab(bbox)
+        except Exception as e:
+            # E.g. exclusive fullscreen or a locked desktop; the caller falls
+            # back to clicking after its timeout
+            logger.debug(f"CS2 banner probe capture failed: {e}")
+            return False
+        return matches_accept_button(image)
@@ -0,0 +1,86 @@
+import re
+from typing import NamedTuple
+
+MATCH_FOUND = "match_found"
+MATCH_ACCEPTED = "match_accepted"
+MATCH_CANCELLED = "match_cancelled"
+MAP_LOADED = "map_loaded"
+DISCONNECTED = "disconnected"
+
+# Named console events: name -> (pattern, literal).
+#
+# ``literal`` must appear verbatim in every line the pattern can match; the
+# byte prefilter looks for it before a line is decoded, so it should be as
+# rare as the line allows. Patterns may only use
+# positional groups — they become the event's ``args``.
+#
+# Match found: "[Client] CheckServerReservation: N @ =[A:1:SESSION_ID:PORT] (...)"
+# Each new accept banner gets a new session id and starts at N=1; subsequent
+# N=2, N=3 are status polls within the SAME banner. We dedup by session id so
+# defective polling never re-fires the click and so consecutive new banners
+# (e.g. when a player declines and a new match is found) both get clicked.
+# A reservation that fails on its first check is a cancellation, not a match.
+CONSOLE_EVENTS = {
+    MATCH_FOUND: (
+        r"\[Client\] CheckServerReservation: 1 @ (=\[[^\]]+\])(?! \(failed)",
+        b"CheckServerReservation: 1 @",
+    ),
+    # Everyone accepted: the client starts connecting to the reserved server
+    MATCH_ACCEPTED: (
+        r"\[Client\] Connecting to (=\[[^\]]+\])",
+        b"Connecting to =[",
+    ),
+    # Someone declined or the reservation timed out. The literal is the
+    # failure suffix: every reservation poll has "CheckServerReservation:"
+    MATCH_CANCELLED: (
+        r"\[Client\] CheckServerReservation: \d+ @ (=\[[^\]]+\]) \(failed",
+        b"] (failed",
+    ),
+    MAP_LOADED: (
+        r"Host activate: Loading \(([^)]+)\)",
+        b"Host activate: Loading",
+    ),
+    DISCONNECTED: (
+        r"Disconnect(?:ing from server)?: (NETWORK_DISCONNECT_\w+)",
+        b"NETWORK_DISCONNECT_",
+    ),
+}
+
+
+class ConsoleEvent(NamedTuple):
+    name: str
+    args: tuple
+    line: str
+
+
+class ConsolePatternSet:
+    """A set of named console patterns behind a shared literal prefilter.
+
+    ``prefilters`` holds one bytes regex per distinct literal (a literal that
+    contains another one is redundant and dropped). The log reader runs them
+    over whole chunks, so lines without any literal — nearly all of them —
+    are never split out or decoded. A pure literal search keeps sre's fast
+    substring path; joining the literals into one alternation would lose it
+    and cost ~15x more per chunk. ``match()`` then only runs the patterns
+    whose literal is in the line, in ``CONSOLE_EVENTS`` order, so match_found
+    is always checked first.
+    """
+
+    def __init__(self, events: dict):
+        self._events = [
+            (name, literal.decode(), re.compile(pattern))
+            for name, (pattern, literal) in events.items()
+        ]
+        literals = {literal for _, literal in events.values()}
+        self.prefilters = tuple(
+            re.compile(re.escape(literal)) for literal in sorted(literals)
+            if not any(other != literal and other in literal for other in literals)
+        )
+
+    def match(self, line: str) -> ConsoleEvent | None:
+        for name, literal, regex in self._events:
+            if literal in line:
+                m = regex.search(line)
+                if m:
+                    return ConsoleEvent(name, m.groups(), line)
+        return None
@@ -1,36 +1,39 @@
 import logging
 import os
-import re
+import sys
 import time
-import winreg
-from threading import Thread
+from threading import Lock, Thread
 
-import ctypes
+if sys.platform == "win32":
+    import winreg
 
-logger = logging.getLogger(__name__)
-
-user32 = ctypes.windll.user32
+from game_lifecycle import CS2
 
-CS2_WINDOW_TITLE = "Counter-Strike 2"
-CS2_APP_ID = "730"
+from .console_events import CONSOLE_EVENTS, MATCH_FOUND, ConsolePatternSet
+from .gsi import GSIListener, ensure_gsi_config, remove_gsi_config
+from . import vdf
+from .localconfig_index import CS2_APP_ID, LOCALCONFIG_APP_PATH, LocalConfigIndex
+from .log_notify import open_change_notifier
 
-# Console log pattern that indicates a match was found.
-# CS2 logs: "[Client] CheckServerReservation: N @ =[A:1:SESSION_ID:PORT] (...)"
-# Each new accept banner gets a new session id and starts at N=1; subsequent
-# N=2, N=3 are status polls within the SAME banner. We dedup by session id so
-# defective polling never re-fires the click and so consecutive new banners
-# (e.g. when a player declines and a new match is found) both get clicked.
-MATCH_FOUND_RE = re.compile(
-    r"\[Client\] CheckServerReservation: 1 @ (=\[[^\]]+\])"
-)
+logger = logging.getLogger(__name__)
 
+# How long the tailer blocks on a change notification before re-checking
+# whether CS2 is still running. Appends are still seen within ~100 ms when
+# notifications lag (see log_notify's Windows backend).
+CHANGE_WAIT_TIMEOUT_SEC = 2.0
+# How often threads blocked on the lifecycle monitor re-check ``running``
+STOP_CHECK_SEC = 1.0
 
-def _is_cs2_running() -> bool:
-    hwnd = user32.FindWindowW(None, CS2_WINDOW_TITLE)
-    return hwnd != 0
+# Tail reads are bounded: at most READ_CHUNK_BYTES per read, and a partial line
+# that grows past MAX_LINE_BYTES is dropped instead of buffered. Match lines are
+# ~100 bytes, so nothing we care about gets near the cap.
+READ_CHUNK_BYTES = 64 * 1024
+MAX_LINE_BYTES = 16 * 1024
 
 
 def _find_steam_path() -> str | None:
+    if sys.platform != "win32":
+        return None
     try:
         key = winreg.OpenKey(
             winreg.HKEY_LOCAL_MACHINE,
@@ -48,143 +51,80 @@ def _find_steam_path() -> str | None:
 
 def _parse_library_folders(vdf_path: str) -> list[str]:
     paths = []
-    if not os.path.exists(vdf_path):
+    try:
+        with open(vdf_path, "rb") as f:
+            folders = vdf.parse(f.read()).get("libraryfolders")
+    except (OSError, vdf.VdfError) as e:
+        logger.debug(f"Could not read {vdf_path}: {e}")
+        return paths
+    if folders is None:
         return paths
-    with open(vdf_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('"path"'):
-                parts = line.split('"')
-                if len(parts) >= 4:
-                    path = parts[3]
-                    steamapps = os.path.join(path, "steamapps")
-                    if os.path.isdir(steamapps):
-                        paths.append(steamapps)
+    for folder in folders.children or ():
+        path = folder.get("path")
+        if path is not None and not path.is_block:
+            steamapps = os.path.join(path.value, "steamapps")
+            if os.path.isdir(steamapps):
+                paths.append(steamapps)
     return paths
 
 
-def _find_localconfig_path(steam_path: str) -> str | None:
-    """Find the localconfig.vdf for the Steam account that owns CS2."""
-    userdata = os.path.join(steam_path, "userdata")
-    if not os.path.isdir(userdata):
-        return None
-
-    best_path = None
-    best_mtime = 0
-    for uid in os.listdir(userdata):
-        candidate = os.path.join(userdata, uid, "config", "localconfig.vdf")
-        if os.path.isfile(candidate):
-            try:
-                mtime = os.path.getmtime(candidate)
-                content = open(candidate, encoding="utf-8", errors="replace").read()
-                # Only consider accounts that have CS2 in their config
-                if f'"{CS2_APP_ID}"' in content and mtime > best_mtime:
-                    best_mtime = mtime
-                    best_path = candidate
-            except OSError:
-                continue
-    return best_path
-
-
-def _has_condebug(steam_path: str) -> bool:
+def _has_condebug(index: LocalConfigIndex) -> bool:
     """Return True if -condebug is already in CS2's Steam launch options."""
-    config_path = _find_localconfig_path(steam_path)
+    config_path = index.best_path()
     if not config_path:
         return False
-    try:
-        with open(config_path, encoding="utf-8", errors="replace") as f:
-            content = f.read()
-        apps_idx = content.find('"apps"')
-        if apps_idx == -1:
-            return False
-        idx730 = content.find(f'"{CS2_APP_ID}"', apps_idx)
-        if idx730 == -1:
-            return False
-        brace_open = content.find("{", idx730)
-        if brace_open == -1:
-            return False
-        depth = 0
-        block_end = brace_open
-        for i in range(brace_open, len(content)):
-            if content[i] == "{":
-                depth += 1
-            elif content[i] == "}":
-                depth -= 1
-                if depth == 0:
-                    block_end = i
-                    break
-        block = content[idx730:block_end]
-        m = re.search(r'"LaunchOptions"\s+"([^"]*)"', block)
-        if not m:
-            return False
-        return "-condebug" in m.group(1).split()
-    except OSError:
-        return False
+    launch_options = index.launch_options(config_path)
+    return launch_options is not None and "-condebug" in launch_options.split()
 
 
-def _ensure_condebug(steam_path: str) -> bool:
+def _ensure_condebug(index: LocalConfigIndex) -> bool:
     """
     Add -condebug to CS2 launch options in Steam's localconfig.vdf if missing.
     Returns True if the file was modified, False if already set or not found.
     """
-    config_path = _find_localconfig_path(steam_path)
+    config_path = index.best_path()
     if not config_path:
         logger.warning("Could not find Steam localconfig.vdf to set -condebug")
         return False
 
-    with open(config_path, encoding="utf-8", errors="replace") as f:
-        content = f.read()
+    with open(config_path, "rb") as f:
+        data = f.read()
 
-    # Find the "730" app block inside the "apps" section
-    apps_idx = content.find('"apps"')
-    if apps_idx == -1:
-        logger.warning("Could not find 'apps' section in localconfig.vdf")
+    try:
+        app = vdf.find(data, LOCALCONFIG_APP_PATH)
+    except vdf.VdfError as e:
+        logger.warning(f"Could not parse localconfig.vdf: {e}")
         return False
-
-    idx730 = content.find(f'"{CS2_APP_ID}"', apps_idx)
-    if idx730 == -1:
+    if app is None or not app.is_block:
         logger.warning("Could not find CS2 (730) block in localconfig.vdf")
         return False
 
-    # Find the end of the 730 block (the closing brace at the right indent level)
-    brace_open = content.find("{", idx730)
-    if brace_open == -1:
-        return False
-    depth = 0
-    block_end = brace_open
-    for i in range(brace_open, len(content)):
-        if content[i] == "{":
-            depth += 1
-        elif content[i] == "}":
-            depth -= 1
-            if depth == 0:
-                block_end = i
-                break
-
-    block = content[idx730:block_end]
-
-    if '"LaunchOptions"' in block:
+    # Splice the edit into the original bytes so the rest of the file is untouched
+    launch_options = app.get("LaunchOptions")
+    if launch_options is not None and not launch_options.is_block:
         # Key exists — add -condebug if not already there
-        def add_flag(m):
-            opts = m.group(1)
-            if "-condebug" in opts.split():
-                return m.group(0)
-            return m.group(0).replace(f'"{opts}"', f'"{(opts + " -condebug").strip()}"')
-
-        new_block = re.sub(r'"LaunchOptions"\s+"([^"]*)"', add_flag, block)
-        if new_block == block:
+        opts = launch_options.value
+        if "-condebug" in opts.split():
             logger.debug("-condebug already set in CS2 launch options")
             return False
-        new_content = content[:idx730] + new_block + content[block_end:]
+        new_data = (data[:launch_options.value_start]
+                    + vdf.quote((opts + " -condebug").strip())
+                    + data[launch_options.value_end:])
     else:
-        # Key absent — insert before the closing brace, matching Steam's tab style
-        insert = '\t\t\t\t\t\t"LaunchOptions"\t\t"-condebug"\n\t\t\t\t\t'
-        new_content = content[:block_end] + insert + content[block_end:]
+        # Key absent — add a line before the closing brace, matching Steam's tab style
+        close = app.value_end - 1
+        line_start = data.rfind(b"\n", 0, close) + 1
+        indent = data[line_start:close]
+        if indent.strip():
+            line_start, indent = close, b""
+        line = indent + b'\t"LaunchOptions"\t\t"-condebug"\n'
+        new_data = data[:line_start] + line + data[line_start:]
 
     tmp_path = config_path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(new_content)
+    with open(tmp_path, "wb") as f:
+        f.write(new_data)
     os.replace(tmp_path, config_path)
+    index.invalidate(config_path)
 
     logger.info(f"Added -condebug to CS2 launch options in {config_path}")
     return True
@@ -213,16 +153,134 @@ def _find_cs2_path() -> str | None:
     return None
 
 
+class ConsoleLogReader:
+    """Incremental binary reader over console.log.
+
+    Keeps one handle open for the whole CS2 session, reads in fixed-size
+    chunks and carries a trailing partial line over to the next read, so a
+    line split across two writes is still seen whole. Only lines with a hit
+    for one of the ``prefilters`` (bytes regexes) are located and decoded; the
+    rest of the chunk is never split into lines.
+    """
+
+    def __init__(self, path: str, prefilters, chunk_size: int = READ_CHUNK_BYTES,
+                 from_start: bool = False):
+        self._prefilters = tuple(prefilters)
+        self._chunk_size = chunk_size
+        self._file = open(path, "rb")
+        # Normally start from end: only lines written during this session matter
+        self._pos = self._file.seek(0, os.SEEK_SET if from_start else os.SEEK_END)
+        self._carry = b""
+        self._discarding = False  # True while skipping an over-long line
+
+    def close(self):
+        self._file.close()
+
+    def size(self) -> int:
+        """Current size of the file, from the open handle (no reopen by name)."""
+        return os.fstat(self._file.fileno()).st_size
+
+    def read_lines(self):
+        """Yield decoded, stripped lines appended since the last call."""
+        try:
+            size = self.size()
+        except OSError:
+            return
+
+        # File was truncated/rewritten by CS2 — reset to beginning
+        if size < self._pos:
+            logger.debug("console.log was truncated, resetting position")
+            self._pos = self._file.seek(0)
+            self._carry = b""
+            self._discarding = False
+
+        while True:
+            chunk = self._file.read(self._chunk_size)
+            if not chunk:
+                return
+            self._pos += len(chunk)
+            yield from self._split(chunk)
+
+    def _split(self, chunk: bytes):
+        last_nl = chunk.rfind(b"\n")
+        if last_nl == -1:
+            body, tail = b"", chunk
+        else:
+            body, tail = chunk[:last_nl], chunk[last_nl + 1:]
+            if self._discarding:
+                # Drop the remainder of an over-long line
+                first_nl = body.find(b"\n")
+                body = body[first_nl + 1:] if first_nl != -1 else b""
+                self._discarding = False
+            else:
+                body = self._carry + body
+            self._carry = b""
+
+        if not self._discarding:
+            if len(self._carry) + len(tail) > MAX_LINE_BYTES:
+                self._carry = b""
+                self._discarding = True
+            else:
+                self._carry += tail
+
+        # Walk prefilter hits and cut out just the lines containing them
+        hits = sorted(m.start() for p in self._prefilters for m in p.finditer(body))
+        line_end = 0
+        for pos in hits:
+            if pos < line_end:
+                continue  # Another hit on a line we already yielded
+            line_start = body.rfind(b"\n", 0, pos) + 1
+            line_end = body.find(b"\n", pos)
+            if line_end == -1:
+                line_end = len(body)
+            line = body[line_start:line_end].decode("utf-8", errors="replace").strip()
+            if line:
+                yield line
+
+
 class CS2ConsoleWatcher:
-    def __init__(self):
+    def __init__(self, lifecycle, localconfig_cache_path=None, gsi_port=None, cs2_path=None):
+        """``cs2_path`` skips discovery of the CS2 install (e.g. for replaying
+        a console.log from a temp dir)."""
         self.running = False
+        self._lifecycle = lifecycle
+        self._gsi_port = gsi_port
+        self._gsi = None
+        self._gsi_lock = Lock()  # the tray toggles GSI from its own thread
+        self._localconfig = LocalConfigIndex(localconfig_cache_path)
         self._callbacks = []
+        self._event_callbacks = {}
+        self._patterns = None
         self._condebug_missing_callbacks = []
-        self._cs2_path = None
+        self._cs2_path = cs2_path
         self._thread = None
 
     def register_callback(self, callback):
+        """Called with the reservation session id when a match is found."""
         self._callbacks.append(callback)
+        self._patterns = None
+
+    def register_event_callback(self, event, callback):
+        """Called with a ``ConsoleEvent`` whenever the named console event
+        (see ``console_events.CONSOLE_EVENTS``) is logged. With GSI enabled,
+        map_loaded and disconnected may also arrive from GSI, usually before
+        the console line."""
+        if event not in CONSOLE_EVENTS:
+            raise ValueError(f"Unknown CS2 console event: {event}")
+        self._event_callbacks.setdefault(event, []).append(callback)
+        self._patterns = None
+
+    def _get_patterns(self) -> ConsolePatternSet:
+        """Matcher over only the events someone subscribed to, so unused
+        patterns cost nothing per line."""
+        if self._patterns is None:
+            wanted = set(self._event_callbacks)
+            if self._callbacks:
+                wanted.add(MATCH_FOUND)
+            self._patterns = ConsolePatternSet(
+                {name: spec for name, spec in CONSOLE_EVENTS.items() if name in wanted}
+            )
+        return self._patterns
 
     def register_condebug_missing_callback(self, callback):
         """Called when CS2 is running but -condebug is not set (after auto-fix attempt)."""
@@ -237,6 +295,21 @@ class CS2ConsoleWatcher:
 
     def stop(self):
         self.running = False
+        with self._gsi_lock:
+            self._stop_gsi()
+
+    def set_gsi_port(self, port):
+        """Turn GSI on (listening on ``port``) or off (None) at runtime.
+        Turning it off also removes our cfg from the CS2 install."""
+        with self._gsi_lock:
+            self._gsi_port = port
+            self._stop_gsi()
+            if not self._cs2_path:
+                return  # Applied once the install is found
+            if port:
+                self._start_gsi()
+            else:
+                remove_gsi_config(self._cs2_path)
 
     def _run_loop(self):
         while self.running:
@@ -247,11 +320,14 @@ class CS2ConsoleWatcher:
                         time.sleep(30)
                         continue
                     logger.info(f"CS2 found at: {self._cs2_path}")
+                    with self._gsi_lock:
+                        if self._gsi_port:
+                            self._start_gsi()
 
                 # Wait for CS2 to launch
                 logger.debug("Waiting for CS2 to launch...")
-                while self.running and not _is_cs2_running():
-                    time.sleep(2.0)
+                while self.running and not self._lifecycle.wait_for(CS2, timeout=STOP_CHECK_SEC):
+                    pass
 
                 if not self.running:
                     break
@@ -261,7 +337,6 @@ class CS2ConsoleWatcher:
 
                 if self.running:
                     logger.debug("CS2 closed, will wait for it again")
-                    time.sleep(1.0)
 
             except Exception as e:
                 logger.error(f"Error in CS2 console watcher: {e}", exc_info=True)
@@ -275,62 +350,73 @@ class CS2ConsoleWatcher:
 
         # Check launch options directly — no guessing from file state
         steam_path = _find_steam_path()
-        if steam_path and not _has_condebug(steam_path):
+        if steam_path:
+            self._localconfig.refresh(steam_path)
+        if steam_path and not _has_condebug(self._localconfig):
             logger.warning("CS2 launch options missing -condebug")
-            fixed = _ensure_condebug(steam_path)
+            fixed = _ensure_condebug(self._localconfig)
             for cb in self._condebug_missing_callbacks:
                 try:
                     cb(fixed)
                 except Exception as e:
                     logger.error(f"Error in condebug missing callback: {e}")
-            # Wait for user to restart CS2 with the flag applied
-            while self.running and _is_cs2_running() and not os.path.exists(log_path):
-                time.sleep(2.0)
 
-        # Wait for console.log to appear (it may take a moment after launch)
-        while self.running and _is_cs2_running() and not os.path.exists(log_path):
-            time.sleep(1.0)
+        # Wait for console.log to appear (it may take a moment after launch, or
+        # until the user restarts CS2 with -condebug applied)
+        while self._cs2_running() and not os.path.exists(log_path):
+            self._lifecycle.wait_for(CS2, running=False, timeout=1.0)
 
-        if not self.running or not _is_cs2_running():
+        if not self._cs2_running():
             return
 
         logger.debug(f"Tailing console.log at: {log_path}")
-        last_size = os.path.getsize(log_path)
-        last_pos = last_size  # Start from end
-
-        while self.running and _is_cs2_running():
+        patterns = self._get_patterns()
+        reader = ConsoleLogReader(log_path, patterns.prefilters)
+        notifier = open_change_notifier(log_path, size=reader.size)
+        try:
+            while self._cs2_running():
+                # Blocks until console.log changes; the timeout only bounds how
+                # long a CS2 exit goes unnoticed while the file is idle.
+                notifier.wait(CHANGE_WAIT_TIMEOUT_SEC)
+                for line in reader.read_lines():
+                    event = patterns.match(line)
+                    if event:
+                        # No break — multiple distinct sessions in one chunk should
+                        # all fire; CS2AutoAccept dedups by session_id.
+                        self._dispatch(event)
+        finally:
+            notifier.close()
+            reader.close()
+
+    def _stop_gsi(self):
+        if self._gsi:
+            self._gsi.stop()
+            self._gsi = None
+
+    def _start_gsi(self):
+        """Install our GSI cfg and listen for its POSTs. Takes effect on the
+        next CS2 launch if CS2 is already running. Call with _gsi_lock held."""
+        token = ensure_gsi_config(self._cs2_path, self._gsi_port)
+        if token is None:
+            return
+        gsi = GSIListener(self._dispatch, token, self._gsi_port)
+        if gsi.start():
+            self._gsi = gsi
+
+    def _cs2_running(self) -> bool:
+        return self.running and self._lifecycle.is_running(CS2)
+
+    def _dispatch(self, event):
+        if event.name == MATCH_FOUND:
+            logger.info(f"CS2 match found: {event.line}")
+            self._notify_callbacks(event.args[0])
+        else:
+            logger.debug(f"CS2 console event {event.name}: {event.line}")
+        for cb in self._event_callbacks.get(event.name, ()):
             try:
-                current_size = os.path.getsize(log_path)
-            except OSError:
-                time.sleep(0.5)
-                continue
-
-            # File was truncated/rewritten by CS2 — reset to beginning
-            if current_size < last_pos:
-                logger.debug("console.log was truncated, resetting position")
-                last_pos = 0
-
-            if current_size == last_pos:
-                time.sleep(0.1)
-                continue
-
-            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
-                f.seek(last_pos)
-                new_data = f.read()
-                last_pos = f.tell()
-
-            for line in new_data.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-
-                m = MATCH_FOUND_RE.search(line)
-                if m:
-                    session_id = m.group(1)
-                    logger.info(f"CS2 match found: {line}")
-                    self._notify_callbacks(session_id)
-                    # No break — multiple distinct sessions in one chunk should
-                    # all fire; CS2AutoAccept dedups by session_id.
+                cb(event)
+            except Exception as e:
+                logger.error(f"Error in CS2 {event.name} callback: {e}")
 
     def _notify_callbacks(self, session_id):
         for cb in self._callbacks:
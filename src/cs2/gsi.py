@@ -0,0 +1,195 @@
+import json
+import logging
+import os
+import secrets
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+from . import vdf
+from .console_events import DISCONNECTED, MAP_LOADED, ConsoleEvent
+
+logger = logging.getLogger(__name__)
+
+GSI_HOST = "127.0.0.1"
+GSI_DEFAULT_PORT = 30730
+GSI_CFG_NAME = "gamestate_integration_qol.cfg"
+# Top-level key of our cfg; CS2 only cares that it's unique among GSI configs
+GSI_CFG_KEY = "QOL-Scripts"
+
+# Reason reported with DISCONNECTED when GSI shows we left the map; the
+# console reports the real NETWORK_DISCONNECT_* reason
+GSI_LEFT_MAP = "GSI_LEFT_MAP"
+
+# Largest payload we accept; full GSI snapshots with only these sections are ~1 KB
+MAX_PAYLOAD_BYTES = 64 * 1024
+
+
+def gsi_config_path(cs2_path: str) -> str:
+    return os.path.join(cs2_path, "game", "csgo", "cfg", GSI_CFG_NAME)
+
+
+def _render_config(port: int, token: str) -> bytes:
+    q = vdf.quote
+    return b"\n".join([
+        q(GSI_CFG_KEY),
+        b"{",
+        b'\t"uri"\t\t' + q(f"http://{GSI_HOST}:{port}"),
+        b'\t"timeout"\t"1.0"',
+        # Send every change immediately; we only want low-frequency sections
+        b'\t"buffer"\t"0.0"',
+        b'\t"throttle"\t"0.0"',
+        b'\t"heartbeat"\t"30.0"',
+        b'\t"auth"',
+        b"\t{",
+        b'\t\t"token"\t' + q(token),
+        b"\t}",
+        b'\t"data"',
+        b"\t{",
+        b'\t\t"provider"\t"1"',
+        b'\t\t"map"\t\t"1"',
+        b"\t}",
+        b"}",
+        b"",
+    ])
+
+
+def ensure_gsi_config(cs2_path: str, port: int) -> str | None:
+    """Write our GSI cfg into CS2's cfg directory if missing or stale.
+
+    Returns the auth token CS2 will send, or None if the cfg couldn't be
+    written. An existing token is kept, so a CS2 session that already loaded
+    the cfg keeps authenticating; CS2 only reads the file at startup.
+    """
+    path = gsi_config_path(cs2_path)
+    token = None
+    old = None
+    try:
+        with open(path, "rb") as f:
+            old = f.read()
+        node = vdf.find(old, (GSI_CFG_KEY, "auth", "token"))
+        if node is not None and not node.is_block and node.value:
+            token = node.value
+    except FileNotFoundError:
+        pass
+    except (OSError, vdf.VdfError) as e:
+        logger.debug(f"Could not read {path}: {e}")
+
+    token = token or secrets.token_hex(16)
+    data = _render_config(port, token)
+    if data == old:
+        return token
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write CS2 GSI config {path}: {e}")
+        return None
+    logger.info(f"Wrote CS2 GSI config to {path} (applies on next CS2 launch)")
+    return token
+
+
+def remove_gsi_config(cs2_path: str):
+    """Delete our GSI cfg, so CS2 stops posting to us from its next launch."""
+    path = gsi_config_path(cs2_path)
+    try:
+        os.remove(path)
+        logger.info(f"Removed CS2 GSI config {path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove CS2 GSI config {path}: {e}")
+
+
+class _GSIRequestHandler(BaseHTTPRequestHandler):
+    server_version = "QOL-GSI"
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if not 0 < length <= MAX_PAYLOAD_BYTES:
+            self.send_response(400)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.rfile.read(length)
+        # Ack first: CS2 waits for the response before sending the next update
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        self.server.listener.handle_payload(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"GSI {self.address_string()}: {format % args}")
+
+
+class GSIListener:
+    """Local HTTP endpoint for CS2 Game State Integration POSTs.
+
+    Turns the pushed game state into the same ``ConsoleEvent``s the console
+    log produces and hands them to ``on_event``. GSI has no matchmaking
+    state, so it can't report match_found; it reports map loads and leaving a
+    map without depending on -condebug or any file I/O.
+    """
+
+    def __init__(self, on_event, token: str | None, port: int = GSI_DEFAULT_PORT):
+        self._on_event = on_event
+        self._token = token
+        self._port = port
+        self._server = None
+        self._lock = Lock()  # requests are served on their own threads
+        self._map = None
+
+    def start(self) -> bool:
+        if self._server:
+            return True
+        try:
+            self._server = ThreadingHTTPServer((GSI_HOST, self._port), _GSIRequestHandler)
+        except OSError as e:
+            logger.warning(f"Could not start CS2 GSI listener on port {self._port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self._server.listener = self
+        Thread(target=self._server.serve_forever, daemon=True, name="cs2-gsi").start()
+        logger.info(f"CS2 GSI listener on http://{GSI_HOST}:{self._port}")
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def handle_payload(self, body: bytes):
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            logger.debug(f"Ignoring malformed GSI payload: {e}")
+            return
+        if not isinstance(payload, dict):
+            return
+        token = (payload.get("auth") or {}).get("token")
+        if self._token and token != self._token:
+            logger.debug("Ignoring GSI payload with wrong auth token")
+            return
+
+        with self._lock:
+            events = self._translate(payload)
+        for event in events:
+            try:
+                self._on_event(event)
+            except Exception as e:
+                logger.error(f"Error in CS2 GSI event callback: {e}")
+
+    def _translate(self, payload: dict) -> list[ConsoleEvent]:
+        events = []
+        map_name = (payload.get("map") or {}).get("name")
+        if map_name and map_name != self._map:
+            events.append(ConsoleEvent(MAP_LOADED, (map_name,), f"GSI map.name={map_name}"))
+        elif not map_name and self._map:
+            events.append(ConsoleEvent(DISCONNECTED, (GSI_LEFT_MAP,), f"GSI left {self._map}"))
+        self._map = map_name
+        return events
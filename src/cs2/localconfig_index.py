@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+
+from . import vdf
+
+logger = logging.getLogger(__name__)
+
+CS2_APP_ID = "730"
+# Where CS2's per-account settings (incl. LaunchOptions) live in localconfig.vdf
+LOCALCONFIG_APP_PATH = ("UserLocalConfigStore", "Software", "Valve", "Steam", "apps", CS2_APP_ID)
+
+
+def _parse_localconfig(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    # Only the 730 block is parsed; every other subtree is skipped
+    app = vdf.find(data, LOCALCONFIG_APP_PATH)
+    launch_options = app.get("LaunchOptions") if app is not None else None
+    return {
+        # Only accounts that have CS2 in their config are candidates
+        "owns_cs2": app is not None,
+        "launch_options": launch_options.value if launch_options is not None else None,
+    }
+
+
+class LocalConfigIndex:
+    """Persistent index of every Steam account's ``localconfig.vdf``.
+
+    Each entry is keyed by path and validated by (size, mtime): ``refresh()``
+    only stats the files and re-parses the ones that changed, so finding the
+    CS2 account and its launch options costs one listdir plus a stat per
+    account in the common case. Pass ``cache_path=None`` for an in-memory
+    index.
+    """
+
+    def __init__(self, cache_path=None):
+        self._cache_path = cache_path
+        self._entries = {}
+        self._load()
+
+    def _load(self):
+        if not self._cache_path:
+            return
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _save(self):
+        if not self._cache_path:
+            return
+        try:
+            tmp_path = f"{self._cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=4)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.debug(f"Failed to save localconfig index: {e}")
+
+    def _update_entry(self, path: str) -> bool:
+        """Re-validate one file; returns True if the entry changed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return self._entries.pop(path, None) is not None
+
+        entry = self._entries.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return False
+
+        try:
+            parsed = _parse_localconfig(path)
+        except (OSError, vdf.VdfError) as e:
+            logger.debug(f"Failed to read {path}: {e}")
+            return self._entries.pop(path, None) is not None
+        self._entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, **parsed}
+        logger.debug(f"Indexed {path} (owns CS2: {parsed['owns_cs2']})")
+        return True
+
+    def refresh(self, steam_path: str):
+        """Bring the index up to date with ``<steam>/userdata/*/config``."""
+        userdata = os.path.join(steam_path, "userdata")
+        try:
+            uids = os.listdir(userdata)
+        except OSError:
+            uids = []
+
+        seen = set()
+        changed = False
+        for uid in uids:
+            candidate = os.path.join(userdata, uid, "config", "localconfig.vdf")
+            seen.add(candidate)
+            changed |= self._update_entry(candidate)
+
+        # Forget accounts that were removed (or a Steam install that moved)
+        for path in [p for p in self._entries if p not in seen]:
+            del self._entries[path]
+            changed = True
+
+        if changed:
+            self._save()
+
+    def invalidate(self, path: str):
+        """Re-index ``path`` after we modified it ourselves."""
+        if self._update_entry(path):
+            self._save()
+
+    def best_path(self) -> str | None:
+        """The most recently written localconfig.vdf of an account that owns CS2."""
+        best_path = None
+        best_mtime = 0
+        for path, entry in self._entries.items():
+            if entry["owns_cs2"] and entry["mtime_ns"] > best_mtime:
+                best_mtime = entry["mtime_ns"]
+                best_path = path
+        return best_path
+
+    def launch_options(self, path: str) -> str | None:
+        entry = self._entries.get(path)
+        return entry["launch_options"] if entry else None
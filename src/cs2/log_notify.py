@@ -0,0 +1,215 @@
+import ctypes
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+if sys.platform == "win32":
+    import pywintypes
+    import win32con
+    import win32event
+    import win32file
+
+logger = logging.getLogger(__name__)
+
+# Stat interval used by the polling fallback (matches the old tail loop)
+POLL_INTERVAL_SEC = 0.1
+
+
+class _PollingNotifier:
+    """Fallback backend: stat the file until its size or mtime changes."""
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL_SEC):
+        self._path = path
+        self._interval = interval
+        self._last = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self._path)
+            return st.st_size, st.st_mtime_ns
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._stat()
+            if current != self._last:
+                self._last = current
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self._interval, remaining))
+
+    def close(self):
+        pass
+
+
+class _InotifyNotifier:
+    """Linux backend: inotify watch on the log's directory, filtered by name.
+
+    Watching the directory (not the file) keeps working across CS2 deleting
+    and recreating console.log between launches.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")  # wd, mask, cookie, len — followed by name
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(None, use_errno=True)
+        directory, name = os.path.split(os.path.abspath(path))
+        self._name = os.fsencode(name)
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._drain():
+                return True
+
+    def _drain(self) -> bool:
+        """Read all queued events; return True if any concern our file."""
+        hit = False
+        while True:
+            try:
+                buf = os.read(self._fd, 4096)
+            except BlockingIOError:
+                return hit
+            offset = 0
+            while offset < len(buf):
+                _wd, _mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                if buf[offset:offset + length].rstrip(b"\0") == self._name:
+                    hit = True
+                offset += length
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _DirectoryChangesNotifier:
+    """Windows backend: overlapped ReadDirectoryChangesW on the log's directory.
+
+    NTFS may defer size and last-write notifications while the writer keeps
+    the file open, as CS2 does with console.log. So the wait also checks the
+    file's current size (not the directory entry's) every POLL_INTERVAL_SEC,
+    which keeps detection at worst as fast as the old tail loop. ``size``
+    reads it from a handle the caller already holds; without one the path
+    is stat'ed, which opens the file each time.
+    """
+
+    FILE_LIST_DIRECTORY = 0x0001
+
+    def __init__(self, path: str, size=None):
+        self._path = path
+        self._read_size = size or (lambda: os.stat(self._path).st_size)
+        self._size = self._stat_size()
+        directory, name = os.path.split(os.path.abspath(path))
+        self._name = name.lower()
+        self._handle = win32file.CreateFile(
+            directory,
+            self.FILE_LIST_DIRECTORY,
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+            None,
+            win32con.OPEN_EXISTING,
+            win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED,
+            None,
+        )
+        self._overlapped = pywintypes.OVERLAPPED()
+        self._overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        self._buffer = win32file.AllocateReadBuffer(8192)
+        self._filter = (win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+                        | win32con.FILE_NOTIFY_CHANGE_SIZE
+                        | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        self._armed = False
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self._armed:
+                win32file.ReadDirectoryChangesW(
+                    self._handle, self._buffer, False, self._filter, self._overlapped
+                )
+                self._armed = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            rc = win32event.WaitForSingleObject(self._overlapped.hEvent,
+                                                int(min(remaining, POLL_INTERVAL_SEC) * 1000))
+            if rc != win32event.WAIT_OBJECT_0:
+                # No notification (possibly deferred): check the file itself
+                if self._size_changed():
+                    return True
+                continue
+            self._armed = False
+            nbytes = win32file.GetOverlappedResult(self._handle, self._overlapped, True)
+            win32event.ResetEvent(self._overlapped.hEvent)
+            if nbytes == 0:
+                self._size_changed()
+                return True  # Buffer overflowed — treat as "something changed"
+            for _action, name in win32file.FILE_NOTIFY_INFORMATION(self._buffer, nbytes):
+                if name.lower() == self._name:
+                    self._size_changed()
+                    return True
+
+    def _stat_size(self):
+        try:
+            return self._read_size()
+        except OSError:
+            return None
+
+    def _size_changed(self) -> bool:
+        size = self._stat_size()
+        changed = size != self._size
+        self._size = size
+        return changed
+
+    def close(self):
+        try:
+            if self._armed:
+                win32file.CancelIo(self._handle)
+            self._handle.Close()
+            self._overlapped.hEvent.Close()
+        except Exception as e:
+            logger.debug(f"Error closing directory change handle: {e}")
+
+
+def open_change_notifier(path: str, size=None):
+    """Return a notifier whose ``wait(timeout)`` blocks until ``path`` changes.
+
+    ``wait`` returns True when the file (probably) changed and False on
+    timeout. ``size`` (e.g. ``ConsoleLogReader.size``) returns the file's
+    current size from an open handle, for backends that have to check it
+    themselves. Falls back to stat polling if the native backend is
+    unavailable.
+    """
+    try:
+        if sys.platform == "win32":
+            return _DirectoryChangesNotifier(path, size)
+        if sys.platform.startswith("linux"):
+            return _InotifyNotifier(path)
+    except Exception as e:
+        logger.warning(f"Change notifications unavailable, polling console.log instead: {e}")
+    return _PollingNotifier(path)
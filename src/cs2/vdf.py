@@ -0,0 +1,195 @@
+"""Minimal KeyValues (VDF) parser for Steam's text config files.
+
+Works on the raw bytes of the file. Every node records the byte offsets of
+its key and value, so callers can edit a value by splicing the original data
+instead of re-serializing (and reformatting) the whole file. ``find()`` only
+builds nodes for the block it returns: siblings along the way are skipped by
+one regex match per level instead of being tokenized.
+"""
+import functools
+import re
+
+_WS = rb'(?:\s++|//[^\n]*+)*+'
+_STR = rb'"(?:[^"\\]++|\\.)*+"'
+_BARE = rb'[^\s"{}]++'
+# Anything inside a block that is not a brace: text, strings, comments.
+_CONTENT = rb'[^{}"/]++|' + _STR + rb'|//[^\n]*+|/'
+
+# One token: a quoted string (group 1), a brace (group 2) or a bare word (group 3).
+# Leading whitespace and // comments are consumed by the same match.
+_TOKEN_RE = re.compile(_WS + rb'(?:"((?:[^"\\]++|\\.)*+)"|([{}])|(' + _BARE + rb'))', re.DOTALL)
+_TRAILER_RE = re.compile(_WS)
+_SKIP_RE = re.compile(rb'(?:' + _CONTENT + rb')*+', re.DOTALL)
+
+
+def _nested_block_pattern(depth: int) -> bytes:
+    """Regex for a ``{...}`` block nested at most ``depth`` levels deep."""
+    inner = _CONTENT if depth == 0 else _CONTENT + rb'|' + _nested_block_pattern(depth - 1)
+    return rb'\{(?:' + inner + rb')*+\}'
+
+
+# Skips a whole subtree in one C-level match. Steam's files rarely nest deeper
+# than this; deeper blocks fall back to walking brace by brace.
+_BLOCK = _nested_block_pattern(8)
+_BLOCK_RE = re.compile(_BLOCK, re.DOTALL)
+_UNESCAPE_RE = re.compile(rb"\\(.)", re.DOTALL)
+_ESCAPES = {b"n": b"\n", b"t": b"\t"}
+
+
+class VdfError(ValueError):
+    pass
+
+
+class VdfNode:
+    """A key with either a string ``value`` or a block of ``children``.
+
+    ``value_start``/``value_end`` span the quoted value (quotes included) or
+    the block from ``{`` to just past ``}``.
+    """
+
+    __slots__ = ("key", "value", "children", "key_start", "value_start", "value_end")
+
+    def __init__(self, key, value, children, key_start, value_start, value_end):
+        self.key = key
+        self.value = value
+        self.children = children
+        self.key_start = key_start
+        self.value_start = value_start
+        self.value_end = value_end
+
+    @property
+    def is_block(self) -> bool:
+        return self.value is None
+
+    def get(self, key: str):
+        """Return the first child named ``key`` (case-insensitive), or None."""
+        key = key.lower()
+        for child in self.children or ():
+            if child.key.lower() == key:
+                return child
+        return None
+
+    def find(self, *keys: str):
+        node = self
+        for key in keys:
+            node = node.get(key)
+            if node is None:
+                return None
+        return node
+
+
+def _decode(raw: bytes) -> str:
+    if b"\\" in raw:
+        raw = _UNESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), raw)
+    return raw.decode("utf-8", errors="replace")
+
+
+def quote(value: str) -> bytes:
+    """Encode ``value`` as a quoted VDF string token."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return b'"' + escaped.encode("utf-8") + b'"'
+
+
+def _skip_block(data: bytes, pos: int) -> int:
+    """``pos`` is at an opening brace; return the offset past its match."""
+    m = _BLOCK_RE.match(data, pos)
+    if m:
+        return m.end()
+    pos += 1
+    depth = 1
+    while True:
+        pos = _SKIP_RE.match(data, pos).end()
+        if pos >= len(data):
+            raise VdfError("Unterminated block")
+        if data[pos] == ord("{"):
+            depth += 1
+        elif data[pos] == ord("}"):
+            depth -= 1
+        else:
+            raise VdfError(f"Unterminated string at offset {pos}")
+        pos += 1
+        if depth == 0:
+            return pos
+
+
+def _parse_value(data: bytes, pos: int, key: str, key_start: int):
+    """Parse the value of ``key``, which ends at ``pos``. Returns (node, end)."""
+    m = _TOKEN_RE.match(data, pos)
+    if not m or m.group(2) == b"}":
+        raise VdfError(f"Key '{key}' has no value")
+    if m.group(2) == b"{":
+        children, end = _parse_block(data, m.end(), False)
+        return VdfNode(key, None, children, key_start, m.start(2), end), end
+    if m.group(1) is not None:
+        node = VdfNode(key, _decode(m.group(1)), None, key_start, m.start(1) - 1, m.end())
+    else:
+        node = VdfNode(key, _decode(m.group(3)), None, key_start, m.start(3), m.end())
+    return node, m.end()
+
+
+def _parse_block(data: bytes, pos: int, top_level: bool):
+    """Parse key/value pairs from ``pos`` until the closing brace (or EOF at
+    top level). Returns (children, offset past the closing brace)."""
+    children = []
+    while True:
+        m = _TOKEN_RE.match(data, pos)
+        if not m:
+            if top_level and _TRAILER_RE.match(data, pos).end() == len(data):
+                return children, len(data)
+            raise VdfError(f"Unexpected data at offset {pos}")
+        if m.group(2) == b"}":
+            if top_level:
+                raise VdfError(f"Unbalanced '}}' at offset {m.start(2)}")
+            return children, m.end()
+        if m.group(2) == b"{":
+            raise VdfError(f"Block without a key at offset {m.start(2)}")
+
+        if m.group(1) is not None:
+            key, key_start = _decode(m.group(1)), m.start(1) - 1
+        else:
+            key, key_start = _decode(m.group(3)), m.start(3)
+        node, pos = _parse_value(data, m.end(), key, key_start)
+        children.append(node)
+
+
+def parse(data: bytes) -> VdfNode:
+    """Parse all of ``data`` into a root block node."""
+    children, end = _parse_block(data, 0, True)
+    return VdfNode("", None, children, 0, 0, end)
+
+
+@functools.lru_cache(maxsize=32)
+def _seek_re(key: str):
+    """Regex that consumes the key/value pairs of one block up to ``key``
+    (case-insensitive, quoted or bare) and captures that key as group 1."""
+    escaped = re.escape(key.encode("utf-8"))
+    target = rb'"(?i:' + escaped + rb')"|(?i:' + escaped + rb')(?![^\s"{}])'
+    pair = (rb'(?!' + target + rb')(?:' + _STR + rb'|' + _BARE + rb')' + _WS
+            + rb'(?:' + _STR + rb'|' + _BARE + rb'|' + _BLOCK + rb')' + _WS)
+    return re.compile(_WS + rb'(?:' + pair + rb')*+(' + target + rb')?', re.DOTALL)
+
+
+def find(data: bytes, path) -> VdfNode | None:
+    """Return the fully parsed node at ``path`` (a sequence of keys,
+    case-insensitive), or None if it doesn't exist.
+    """
+    pos = 0
+    for depth, key in enumerate(path):
+        m = _seek_re(key).match(data, pos)
+        if m.group(1) is None:
+            stop = m.end()
+            if depth == 0 and stop == len(data) or depth > 0 and data[stop:stop + 1] == b"}":
+                return None
+            # Something the seek regex can't step over (a block nested deeper
+            # than _BLOCK allows, or malformed data): parse the rest of this
+            # block the slow way.
+            children, _ = _parse_block(data, pos, depth == 0)
+            return VdfNode("", None, children, 0, pos, pos).find(*path[depth:])
+
+        if depth == len(path) - 1:
+            return _parse_value(data, m.end(), key, m.start(1))[0]
+        brace = _TOKEN_RE.match(data, m.end())
+        if not brace or brace.group(2) != b"{":
+            return None
+        pos = brace.end()
+    return None
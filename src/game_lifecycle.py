@@ -0,0 +1,212 @@
+import ctypes
+import logging
+import threading
+from threading import Thread
+
+logger = logging.getLogger(__name__)
+
+CS2 = "cs2"
+LOL_CLIENT = "lol_client"
+
+# name -> (window class, window title) as passed to FindWindowW; None matches any
+GAME_WINDOWS = {
+    CS2: (None, "Counter-Strike 2"),
+    # RCLIENT is the window class for LeagueClientUx
+    LOL_CLIENT: ("RCLIENT", None),
+}
+
+# Window events a backend reports to the monitor
+WINDOW_APPEARED = "appeared"    # created, shown or renamed: a game window may now exist
+WINDOW_DESTROYED = "destroyed"
+
+
+class WinEventBackend:
+    """Reports top-level window create/show/rename/destroy via WinEvent hooks.
+
+    The hooks run on a dedicated thread with its own message loop, like
+    ``FocusMonitor``. Windows calls them out-of-context, so watching these
+    events costs nothing while no windows come or go.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._thread_id = None
+        self._on_event = None
+
+    def find_window(self, window_class, title) -> int:
+        return ctypes.windll.user32.FindWindowW(window_class, title) or 0
+
+    def start(self, on_event):
+        self._on_event = on_event
+        ready = threading.Event()
+        self._thread = Thread(target=self._loop, args=(ready,), daemon=True, name="game-lifecycle")
+        self._thread.start()
+        # Hooks must be in place before the monitor takes its initial snapshot,
+        # or a game launched in between would go unnoticed
+        ready.wait(timeout=5.0)
+
+    def stop(self):
+        if self._thread_id:
+            WM_QUIT = 0x0012
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+
+    def _on_win_event(self, _hook_handle, event_id, hwnd, id_object,
+                      id_child, _event_thread_id, _event_time_ms):
+        OBJID_WINDOW = 0
+        CHILDID_SELF = 0
+        if id_object != OBJID_WINDOW or id_child != CHILDID_SELF or not hwnd:
+            return
+        try:
+            EVENT_OBJECT_DESTROY = 0x8001
+            if event_id == EVENT_OBJECT_DESTROY:
+                self._on_event(WINDOW_DESTROYED, hwnd)
+                return
+            GA_ROOT = 2
+            if ctypes.windll.user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                self._on_event(WINDOW_APPEARED, hwnd)
+        except Exception as e:
+            logger.error(f"Error in game lifecycle event: {e}")
+
+    def _loop(self, ready):
+        from win32_window_monitor import init_com, set_win_event_hook, HookEvent
+        from focus_monitor import _run_message_loop
+
+        hooks = []
+        try:
+            self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+            with init_com():
+                # CS2 creates its window before giving it a title, so renames
+                # count as "appeared" too
+                for event in (HookEvent.OBJECT_CREATE,
+                              HookEvent.OBJECT_SHOW,
+                              HookEvent.OBJECT_NAMECHANGE,
+                              HookEvent.OBJECT_DESTROY):
+                    hooks.append(set_win_event_hook(self._on_win_event, event))
+                logger.debug("Game lifecycle hooks registered")
+                ready.set()
+                _run_message_loop()
+        except Exception as e:
+            logger.error(f"Error in game lifecycle loop: {e}")
+        finally:
+            ready.set()
+            for hook in hooks:
+                if hook:
+                    try:
+                        hook.unhook()
+                    except Exception:
+                        pass
+
+
+class FakeLifecycleBackend:
+    """In-memory backend for running the monitor without Windows.
+
+    ``open_window()``/``close_window()`` stand in for a game window being
+    created or destroyed and emit the same events as ``WinEventBackend``.
+    """
+
+    def __init__(self):
+        self._windows = {}   # (window class, title) -> hwnd
+        self._next_hwnd = 1
+        self._on_event = None
+
+    def find_window(self, window_class, title) -> int:
+        for (cls, text), hwnd in self._windows.items():
+            if (window_class is None or cls == window_class) and (title is None or text == title):
+                return hwnd
+        return 0
+
+    def start(self, on_event):
+        self._on_event = on_event
+
+    def stop(self):
+        self._on_event = None
+
+    def open_window(self, window_class, title) -> int:
+        hwnd = self._next_hwnd
+        self._next_hwnd += 1
+        self._windows[(window_class, title)] = hwnd
+        if self._on_event:
+            self._on_event(WINDOW_APPEARED, hwnd)
+        return hwnd
+
+    def close_window(self, window_class, title):
+        hwnd = self._windows.pop((window_class, title), 0)
+        if hwnd and self._on_event:
+            self._on_event(WINDOW_DESTROYED, hwnd)
+
+
+class GameLifecycleMonitor:
+    """Single service that knows which games are running.
+
+    A backend reports window events; on each one the monitor re-checks only
+    the games it could affect (FindWindow for games not yet running, and the
+    game that owned a destroyed window) and publishes started/stopped
+    transitions. Consumers block in ``wait_for()``, so they react to a launch
+    as soon as its window exists instead of on the next poll.
+    """
+
+    def __init__(self, games=None, backend=None):
+        self._games = dict(games or GAME_WINDOWS)
+        self._backend = backend or WinEventBackend()
+        self._cond = threading.Condition()
+        self._hwnds = {name: 0 for name in self._games}   # 0 = not running
+        # Serializes lookup + publish, so a refresh from start() and one from
+        # the hook thread can't publish an older lookup over a newer one
+        self._refresh_lock = threading.Lock()
+        self._stopped = False
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._backend.start(self._on_window_event)
+        # Pick up games that were already running before we started
+        for name in self._games:
+            self._refresh(name)
+        logger.info("Game lifecycle monitor started")
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._backend.stop()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()  # wake all waiters so they can exit
+
+    def is_running(self, name: str) -> bool:
+        with self._cond:
+            return bool(self._hwnds[name])
+
+    def wait_for(self, name: str, running: bool = True, timeout: float | None = None) -> bool:
+        """Block until game ``name`` is (or is no longer) running.
+
+        Returns False if the monitor stopped or ``timeout`` ran out first.
+        """
+        with self._cond:
+            reached = self._cond.wait_for(
+                lambda: self._stopped or bool(self._hwnds[name]) == running, timeout
+            )
+            return reached and not self._stopped
+
+    def _on_window_event(self, kind, hwnd):
+        with self._cond:
+            if kind == WINDOW_DESTROYED:
+                names = [name for name, owner in self._hwnds.items() if owner == hwnd]
+            else:
+                names = [name for name, owner in self._hwnds.items() if not owner]
+        for name in names:
+            self._refresh(name)
+
+    def _refresh(self, name):
+        with self._refresh_lock:
+            hwnd = self._backend.find_window(*self._games[name])
+            with self._cond:
+                was_running = bool(self._hwnds[name])
+                self._hwnds[name] = hwnd
+                if bool(hwnd) == was_running:
+                    return
+                self._cond.notify_all()
+        logger.info(f"Game {'started' if hwnd else 'stopped'}: {name}")
+
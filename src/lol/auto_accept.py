@@ -1,7 +1,10 @@
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+READY_CHECK_ACCEPT = '/lol-matchmaking/v1/ready-check/accept'
+
 
 class LoLAutoAccept:
     """
@@ -12,11 +15,15 @@ class LoLAutoAccept:
     def __init__(self, settings):
         self.settings = settings
         self.accepted_this_check = False
+        # Round trip of the last accept POST, for checking the pre-warm
+        self.last_accept_rtt_ms = None
 
     def register_ws_handlers(self, connector):
         """Register the ready-check event handler with the shared connector."""
 
-        @connector.ws.register('/lol-matchmaking/v1/ready-check', event_types=('CREATE', 'UPDATE', 'DELETE'))
+        # A ready check only pops while queued
+        @connector.ws.register('/lol-matchmaking/v1/ready-check', event_types=('CREATE', 'UPDATE', 'DELETE'),
+                               phases=('Matchmaking', 'ReadyCheck'))
         async def on_ready_check(connection, event):
             # Reset flag when ready check ends
             if event.type == 'Delete':
@@ -26,17 +33,42 @@ class LoLAutoAccept:
             if self.accepted_this_check:
                 return
 
+            # The resource also exists outside a pop (e.g. 'Invalid' while
+            # searching); only a ready check still waiting on us is accepted
+            check = event.data or {}
+            if check.get('state') != 'InProgress' or check.get('playerResponse') != 'None':
+                return
+
             if self.settings.data.get("auto_accept_enabled", True):
                 self.accepted_this_check = True
                 try:
-                    await connection.request('post', '/lol-matchmaking/v1/ready-check/accept')
-                    logger.info("Match auto-accepted")
+                    status = await self._accept(connection)
+                    if status >= 400:
+                        self.accepted_this_check = False
+                        logger.error(f"Failed to auto-accept match: HTTP {status}")
+                    else:
+                        logger.info(f"Match auto-accepted ({self.last_accept_rtt_ms:.1f} ms)")
                 except Exception as e:
                     self.accepted_this_check = False
                     logger.error(f"Failed to auto-accept match: {e}")
             else:
                 logger.debug("Ready check detected but auto-accept is disabled")
 
+    def on_gameflow_phase(self, connection, phase):
+        """Gameflow phase callback: a ready check is over once its phase is."""
+        if phase != 'ReadyCheck':
+            # The ready check's DELETE may come after we unsubscribed
+            self.accepted_this_check = False
+
+    async def _accept(self, connection) -> int:
+        """POST the accept; returns the HTTP status."""
+        # The connector keeps the connection warm while queued
+        sent_at = time.perf_counter()
+        response = await connection.request('post', READY_CHECK_ACCEPT)
+        response.release()
+        self.last_accept_rtt_ms = (time.perf_counter() - sent_at) * 1000
+        return response.status
+
     def on_disconnect(self):
         """Called when LCU disconnects."""
         self.accepted_this_check = False
@@ -1,29 +1,50 @@
-import logging
 import asyncio
+import logging
+import time
+
+from .champ_select import ChampSelectSession
+from .lock_scheduler import LockScheduler
 
 logger = logging.getLogger(__name__)
 
+SESSION = '/lol-champ-select/v1/session'
+# Owned, free-rotation and not disabled champions; the client rejects a
+# hover of anything else
+PICKABLE_CHAMPIONS = '/lol-champ-select/v1/pickable-champion-ids'
+# How long a hover waits for the pickable list before going without it
+PICKABLE_WAIT_SEC = 0.3
+
 
 class LoLAutoPick:
     """
     WebSocket-based LoL champion auto-picker.
     Automatically hovers the configured default champion based on assigned role.
-    Auto-locks if timer is below threshold.
+    Auto-locks the hovered champion just before the pick timer runs out.
+    Only champions the client lists as pickable are hovered.
+    The pick timer is read against ``clock`` (the wall clock by default).
     """
-    AUTO_LOCK_THRESHOLD_MS = 5000  # Lock champion if less than 5 seconds left
 
-    def __init__(self, settings):
+    def __init__(self, settings, clock=None):
         self.settings = settings
         self.hovered_this_session = False
         self.locked_this_session = False
-        self.lock_timer_task = None
-        self.current_action_id = None
         self.current_connection = None
+        self.session = ChampSelectSession(clock)
+        # None until known for this champ select (or if the client won't say)
+        self.pickable_champion_ids = None
+        # Whether the list arrived since the last session event, i.e. it may
+        # belong to a champ select we haven't seen yet
+        self._pickable_fresh = False
+        self._pickable_task = None
+        self.lock_scheduler = LockScheduler(self._lock_hovered_champion, clock)
 
     def register_ws_handlers(self, connector):
         """Register the champion select event handler with the shared connector."""
 
-        @connector.ws.register('/lol-champ-select/v1/session', event_types=('CREATE', 'UPDATE'))
+        # Subscribed before champ select starts (custom games go straight
+        # from the lobby), so the session's CREATE isn't missed
+        @connector.ws.register(SESSION, event_types=('CREATE', 'UPDATE'),
+                               phases=('Lobby', 'Matchmaking', 'ReadyCheck', 'ChampSelect'))
         async def on_champ_select(connection, event):
             if not self.settings.data.get("auto_pick_enabled", True):
                 logger.debug("Champion select event but auto-pick is disabled")
@@ -34,32 +55,46 @@ class LoLAutoPick:
             except Exception as e:
                 logger.error(f"Error handling champion select: {e}")
 
+        # E.g. a champion disabled mid-draft. Only ever changes in champ
+        # select, so no phases=: that would add a catch-up GET on top of ours
+        @connector.ws.register(PICKABLE_CHAMPIONS, event_types=('CREATE', 'UPDATE'))
+        async def on_pickable_champions(connection, event):
+            self._set_pickable(event.data)
+
     async def _handle_champ_select(self, connection, event):
         """Handle champion select session events"""
         data = event.data
         if not data:
             return
 
+        session = self.session
+        previous_game_id = session.game_id
         if event.type == 'Create':
+            session.reset()
+        session.update(data)
+        if event.type == 'Create' or session.game_id != previous_game_id:
+            # A new champ select, whether or not we saw its CREATE (it may
+            # come as the catch-up UPDATE of a just subscribed handler)
             self.hovered_this_session = False
             self.locked_this_session = False
-            self._cancel_lock_timer()
+            self.lock_scheduler.cancel()
             logger.info("Entered champion select")
+            self._cancel_pickable_fetch()
+            if not self._pickable_fresh:
+                # The client usually pushes the list just before the
+                # session; if it didn't, fetch it once, in the background:
+                # our pick turn is usually bans away
+                self.pickable_champion_ids = None
+                self._pickable_task = asyncio.create_task(self._fetch_pickable(connection))
+        self._pickable_fresh = False
 
         if self.locked_this_session:
             return
 
-        local_cell_id = data.get('localPlayerCellId')
-        if local_cell_id is None:
+        if session.local_cell_id is None:
             return
 
-        my_team = data.get('myTeam', [])
-        assigned_position = None
-        for player in my_team:
-            if player.get('cellId') == local_cell_id:
-                assigned_position = player.get('assignedPosition', '')
-                break
-
+        assigned_position = session.assigned_position
         if not assigned_position:
             logger.debug("No assigned position found (might be blind pick)")
             return
@@ -73,157 +108,151 @@ class LoLAutoPick:
             logger.debug(f"No default champion configured for {assigned_position}")
             return
 
-        # Get unavailable champions (banned or picked by others)
-        unavailable = self._get_unavailable_champions(data, local_cell_id)
-
-        # Choose champion: primary if available, else secondary
-        if primary_id and primary_id not in unavailable:
-            champion_id = primary_id
-            logger.debug(f"Using primary champion {champion_id} for {assigned_position}")
-        elif secondary_id and secondary_id not in unavailable:
-            champion_id = secondary_id
-            logger.debug(f"Primary unavailable, using secondary champion {champion_id} for {assigned_position}")
-        else:
-            logger.debug(f"Both primary and secondary champions unavailable for {assigned_position}")
-            return
-
-        actions = data.get('actions', [])
-        my_pick_action = None
-        for action_group in actions:
-            for action in action_group:
-                if (action.get('actorCellId') == local_cell_id and
-                    action.get('type') == 'pick' and
-                    not action.get('completed', False)):
-                    my_pick_action = action
-                    break
-            if my_pick_action:
-                break
-
+        my_pick_action = session.my_pick_action
         if not my_pick_action:
             logger.debug("No pending pick action found")
             return
 
-        action_id = my_pick_action.get('id')
-        current_champion = my_pick_action.get('championId', 0)
-        is_our_turn = my_pick_action.get('isInProgress', False)
-        # Get timer info
-        timer = data.get('timer', {})
-        time_left = timer.get('adjustedTimeLeftInPhase', 99999)
-        logger.debug(f"Pick action: is_our_turn={is_our_turn}, champion={current_champion}, time_left={time_left}ms")
+        action_id = my_pick_action.id
+        current_champion = my_pick_action.champion_id
+        is_our_turn = my_pick_action.in_progress
+        will_hover = not self.hovered_this_session and is_our_turn and current_champion == 0
+        if will_hover and self._pickable_task is not None and not self._pickable_task.done():
+            # Our turn came first: rather wait a little for the list than
+            # send a hover the client may reject, but not the whole turn
+            await asyncio.wait((self._pickable_task,), timeout=PICKABLE_WAIT_SEC)
+
+        champion_id = self._choose_champion(primary_id, secondary_id, assigned_position)
+        if champion_id is None:
+            return
+        time_left = session.phase_time_left_ms()
+        time_left = 'n/a' if time_left is None else f"{time_left:.0f}ms"
+        logger.debug(f"Pick action: is_our_turn={is_our_turn}, champion={current_champion}, time_left={time_left}")
 
         # Hover champion if we haven't yet, it's our turn, and no champion is selected
         # Don't overwrite if user has already hovered/selected a champion manually
-        if not self.hovered_this_session and is_our_turn and current_champion == 0:
+        if will_hover:
             try:
+                sent_at = time.perf_counter()
                 await connection.request(
                     'patch',
                     f'/lol-champ-select/v1/session/actions/{action_id}',
                     data={'championId': champion_id, 'completed': False}
                 )
+                self.lock_scheduler.rtt.add_sample((time.perf_counter() - sent_at) * 1000)
                 self.hovered_this_session = True
                 logger.info(f"Auto-hovered champion {champion_id} for {assigned_position}")
             except Exception as e:
                 logger.error(f"Failed to hover champion: {e}")
 
-        # Schedule auto-lock timer if it's our turn and we have a champion
+        # (Re)schedule the auto-lock on every update while it's our turn and
+        # we have a champion, so it tracks the latest timer
         auto_lock_enabled = self.settings.data.get("auto_lock_enabled", True)
-        if auto_lock_enabled and is_our_turn and current_champion > 0:
-            # Store connection and action_id for the timer callback
+        phase_ends_at = session.phase_ends_at_ms
+        if auto_lock_enabled and is_our_turn and current_champion > 0 and phase_ends_at is not None:
             self.current_connection = connection
-            self.current_action_id = action_id
-
-            # Schedule lock timer if not already scheduled
-            if self.lock_timer_task is None or self.lock_timer_task.done():
-                delay_ms = time_left - self.AUTO_LOCK_THRESHOLD_MS
-                if delay_ms > 0:
-                    delay_sec = delay_ms / 1000.0
-                    logger.debug(f"Scheduling auto-lock in {delay_sec:.1f}s")
-                    self.lock_timer_task = asyncio.create_task(
-                        self._auto_lock_after_delay(delay_sec)
-                    )
+            self.lock_scheduler.schedule(phase_ends_at)
         elif not is_our_turn:
             # Not our turn anymore, cancel any pending timer
-            self._cancel_lock_timer()
-
-    def _get_unavailable_champions(self, data, local_cell_id):
-        """Get set of champion IDs that are banned or picked by others"""
-        unavailable = set()
-
-        actions = data.get('actions', [])
-        for action_group in actions:
-            for action in action_group:
-                if not action.get('completed', False):
-                    continue
-
-                champion_id = action.get('championId', 0)
-                if champion_id == 0:
-                    continue
-
-                action_type = action.get('type', '')
-
-                # All completed bans make champions unavailable
-                if action_type == 'ban':
-                    unavailable.add(champion_id)
-                # Picks by others (not us) make champions unavailable
-                elif action_type == 'pick' and action.get('actorCellId') != local_cell_id:
-                    unavailable.add(champion_id)
-
-        if unavailable:
-            logger.debug(f"Unavailable champions: {unavailable}")
-
-        return unavailable
-
-    def _cancel_lock_timer(self):
-        """Cancel any pending lock timer"""
-        if self.lock_timer_task and not self.lock_timer_task.done():
-            self.lock_timer_task.cancel()
-            logger.debug("Cancelled auto-lock timer")
-        self.lock_timer_task = None
-
-    async def _auto_lock_after_delay(self, delay_sec):
-        """Wait for delay then lock the currently hovered champion"""
+            self.lock_scheduler.cancel()
+
+    def _is_available(self, champion_id) -> bool:
+        """Pickable by us (if the client told us) and not banned or picked
+        by someone else."""
+        if self.pickable_champion_ids is not None and champion_id not in self.pickable_champion_ids:
+            return False
+        return not self.session.is_unavailable(champion_id)
+
+    def _choose_champion(self, primary_id, secondary_id, assigned_position):
+        """Primary if available, else secondary, else None."""
+        if primary_id and self._is_available(primary_id):
+            logger.debug(f"Using primary champion {primary_id} for {assigned_position}")
+            return primary_id
+        if secondary_id and self._is_available(secondary_id):
+            logger.debug(f"Primary unavailable, using secondary champion {secondary_id} for {assigned_position}")
+            return secondary_id
+        logger.debug(f"Both primary and secondary champions unavailable for {assigned_position}: "
+                     f"{set(self.session.unavailable)}"
+                     f"{'' if self.pickable_champion_ids is None else ' or not pickable'}")
+        return None
+
+    async def _fetch_pickable(self, connection):
         try:
-            await asyncio.sleep(delay_sec)
-
-            if self.locked_this_session:
-                return
-
-            if not self.current_connection:
-                return
-
-            # Fetch current session to get the champion the user has hovered
-            session = await self.current_connection.request(
-                'get', '/lol-champ-select/v1/session'
+            response = await connection.request('get', PICKABLE_CHAMPIONS)
+            if response.status == 200:
+                self._set_pickable(await response.json())
+            else:
+                response.release()
+                logger.debug(f"Pickable champions unavailable (HTTP {response.status})")
+        except Exception as e:
+            logger.debug(f"Failed to fetch pickable champions: {e}")
+
+    def _set_pickable(self, champion_ids):
+        if isinstance(champion_ids, list):
+            self.pickable_champion_ids = frozenset(champion_ids)
+            self._pickable_fresh = True
+            logger.debug(f"{len(self.pickable_champion_ids)} pickable champions")
+
+    def _cancel_pickable_fetch(self):
+        if self._pickable_task is not None:
+            self._pickable_task.cancel()
+            self._pickable_task = None
+
+    def _reset_pickable(self):
+        self._cancel_pickable_fetch()
+        self.pickable_champion_ids = None
+        self._pickable_fresh = False
+
+    def _cached_lock_action(self):
+        """Our in-progress pick action from the WebSocket-fed session, or None
+        if the cached state can't be trusted to lock from: no champion
+        hovered, or the phase it describes should already be over."""
+        action = self.session.my_pick_action
+        if action is None or not action.in_progress or not action.champion_id:
+            return None
+        time_left = self.session.phase_time_left_ms()
+        if time_left is None or time_left <= 0:
+            return None
+        return action
+
+    async def _lock_hovered_champion(self) -> bool:
+        """Lock the currently hovered champion; True if the lock was sent.
+
+        The session is kept current by the WebSocket handler, so the lock
+        PATCH normally goes out without a GET first; REST is only the
+        fallback when the cached state looks stale."""
+        if self.locked_this_session or not self.current_connection:
+            return False
+        try:
+            action = self._cached_lock_action()
+            if action is None:
+                # The WebSocket stream may have missed something (or lags
+                # behind); ask the client for the session itself
+                logger.debug("Cached champ select session is stale, fetching it")
+                response = await self.current_connection.request('get', SESSION)
+                if response.status != 200:
+                    return False
+                self.session.update(await response.json())
+                action = self.session.my_pick_action
+
+            if not action or action.champion_id <= 0:
+                return False
+            await self.current_connection.request(
+                'patch',
+                f'/lol-champ-select/v1/session/actions/{action.id}',
+                data={'championId': action.champion_id, 'completed': True}
             )
-            session_data = await session.json()
-
-            local_cell_id = session_data.get('localPlayerCellId')
-            actions = session_data.get('actions', [])
-
-            # Find current pick action and its champion
-            for action_group in actions:
-                for action in action_group:
-                    if (action.get('actorCellId') == local_cell_id and
-                        action.get('type') == 'pick' and
-                        not action.get('completed', False)):
-                        champion_id = action.get('championId', 0)
-                        action_id = action.get('id')
-                        if champion_id > 0:
-                            await self.current_connection.request(
-                                'patch',
-                                f'/lol-champ-select/v1/session/actions/{action_id}',
-                                data={'championId': champion_id, 'completed': True}
-                            )
-                            self.locked_this_session = True
-                            logger.info(f"Auto-locked champion {champion_id}")
-                        return
-        except asyncio.CancelledError:
-            logger.debug("Auto-lock timer was cancelled")
+            self.locked_this_session = True
+            logger.info(f"Auto-locked champion {action.champion_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to auto-lock champion: {e}")
+            return False
 
     def on_disconnect(self):
         """Called when LCU disconnects."""
-        self._cancel_lock_timer()
+        self.lock_scheduler.cancel()
         self.hovered_this_session = False
         self.locked_this_session = False
+        self.session.reset()
+        self._reset_pickable()
@@ -0,0 +1,156 @@
+import logging
+from collections import Counter
+
+from .clock import WallClock
+
+logger = logging.getLogger(__name__)
+
+
+class _Action:
+    """The fields of a champ select action the auto-picker reads."""
+    __slots__ = ('id', 'order', 'actor_cell_id', 'type', 'champion_id', 'completed', 'in_progress')
+
+    def __init__(self, action_id, order):
+        self.id = action_id
+        self.order = order
+        self.actor_cell_id = None
+        self.type = ''
+        self.champion_id = 0
+        self.completed = False
+        self.in_progress = False
+
+    @staticmethod
+    def state_of(data) -> tuple:
+        return (
+            data.get('actorCellId'),
+            data.get('type', ''),
+            data.get('championId', 0),
+            data.get('completed', False),
+            data.get('isInProgress', False),
+        )
+
+    @property
+    def state(self) -> tuple:
+        return (self.actor_cell_id, self.type, self.champion_id, self.completed, self.in_progress)
+
+    @state.setter
+    def state(self, state):
+        self.actor_cell_id, self.type, self.champion_id, self.completed, self.in_progress = state
+
+
+class ChampSelectSession:
+    """Incrementally maintained view of ``/lol-champ-select/v1/session``.
+
+    Every session event carries the whole session, but between two updates
+    usually only one or two actions and the timer change. ``update()`` diffs
+    the payload against the indexed actions and cells and only touches the
+    derived state (unavailable champions, our pending pick) for what moved,
+    so the pick decision reads precomputed fields.
+
+    The time left in the phase is read against ``clock`` (a ``WallClock``
+    by default).
+    """
+
+    def __init__(self, clock=None):
+        self._clock = clock or WallClock()
+        self.reset()
+
+    def reset(self):
+        self.game_id = None
+        self.local_cell_id = None
+        self.timer = {}
+        self._cells = {}
+        self._actions = {}
+        # Champion id -> number of completed bans/other players' picks of it
+        self._unavailable = Counter()
+        # Our not yet completed pick actions, by id
+        self._pending_picks = {}
+
+    def update(self, data):
+        """Apply a session payload (CREATE or UPDATE event data)."""
+        game_id = data.get('gameId')
+        local_cell_id = data.get('localPlayerCellId')
+        if game_id != self.game_id or local_cell_id != self.local_cell_id:
+            # New lobby (or dodge and requeue): nothing indexed carries over
+            self.reset()
+            self.game_id = game_id
+            self.local_cell_id = local_cell_id
+
+        self.timer = data.get('timer') or {}
+
+        for player in data.get('myTeam', ()):
+            self._cells[player.get('cellId')] = player
+
+        order = 0
+        for action_group in data.get('actions', ()):
+            for action_data in action_group:
+                order += 1
+                action_id = action_data.get('id')
+                state = _Action.state_of(action_data)
+                action = self._actions.get(action_id)
+                if action is None:
+                    action = self._actions[action_id] = _Action(action_id, order)
+                elif action.state == state:
+                    continue
+                else:
+                    self._forget(action)
+                action.state = state
+                self._index(action)
+                logger.debug(f"Champ select action {action_id}: {action.type} "
+                             f"champion={action.champion_id} completed={action.completed}")
+
+    def _blocks(self, action) -> bool:
+        """True if ``action`` takes its champion out of our pool."""
+        if not action.completed or not action.champion_id:
+            return False
+        return action.type == 'ban' or (action.type == 'pick' and action.actor_cell_id != self.local_cell_id)
+
+    def _forget(self, action):
+        if self._blocks(action):
+            self._unavailable[action.champion_id] -= 1
+            if not self._unavailable[action.champion_id]:
+                del self._unavailable[action.champion_id]
+        self._pending_picks.pop(action.id, None)
+
+    def _index(self, action):
+        if self._blocks(action):
+            self._unavailable[action.champion_id] += 1
+        elif action.type == 'pick' and action.actor_cell_id == self.local_cell_id and not action.completed:
+            self._pending_picks[action.id] = action
+
+    @property
+    def assigned_position(self) -> str:
+        """Our role, or '' in modes without positions (blind pick)."""
+        player = self._cells.get(self.local_cell_id)
+        return (player.get('assignedPosition') or '') if player else ''
+
+    @property
+    def phase_ends_at_ms(self) -> float | None:
+        """Epoch ms the current phase ends at per the last timer we saw, or
+        None if there's no timer or it doesn't run out. The timer's
+        ``internalNowInEpochMs`` is the client's wall clock when it built the
+        payload, on this machine, so this doesn't drift however late the
+        event was handled."""
+        stamped_at = self.timer.get('internalNowInEpochMs')
+        if stamped_at is None or self.timer.get('isInfinite', False):
+            return None
+        return stamped_at + self.timer.get('adjustedTimeLeftInPhase', 0)
+
+    def phase_time_left_ms(self) -> float | None:
+        phase_ends_at = self.phase_ends_at_ms
+        return None if phase_ends_at is None else phase_ends_at - self._clock.now_ms()
+
+    def is_unavailable(self, champion_id) -> bool:
+        """Banned, or picked by someone else."""
+        return champion_id in self._unavailable
+
+    @property
+    def unavailable(self):
+        return self._unavailable.keys()
+
+    @property
+    def my_pick_action(self) -> _Action | None:
+        """Our first pick action that isn't completed yet."""
+        if not self._pending_picks:
+            return None
+        return min(self._pending_picks.values(), key=lambda action: action.order)
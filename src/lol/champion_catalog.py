@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+import threading
+
+from .lcu_api import OWNED_CHAMPIONS, owned_champion_ids
+
+logger = logging.getLogger(__name__)
+
+CURRENT_SUMMONER = '/lol-summoner/v1/current-summoner'
+
+
+class ChampionCatalog:
+    """On-disk cache of each account's owned champions.
+
+    ``load()`` returns the last account's champions straight from disk, so
+    the settings window can render without the League client. ``refresh()``
+    fetches the current account's list over the LCU and persists it.
+    """
+
+    def __init__(self, cache_path):
+        self._cache_path = cache_path
+        self._lock = threading.Lock()
+        self._data = {"last_account": None, "accounts": {}}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data.get("accounts"), dict):
+                self._data = data
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _save(self):
+        try:
+            tmp_path = f"{self._cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=4)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.debug(f"Failed to save champion catalog: {e}")
+
+    def load(self) -> dict:
+        """{champion name: id} of the most recently seen account (may be empty)."""
+        with self._lock:
+            account = self._data["accounts"].get(self._data["last_account"] or "")
+            return dict(account["champions"]) if account else {}
+
+    def refresh(self, api) -> dict | None:
+        """Fetch the logged-in account's owned champions and cache them.
+        Returns None if the client isn't reachable or not logged in."""
+        results = api.get_many([CURRENT_SUMMONER, OWNED_CHAMPIONS])
+        summoner, owned = results[CURRENT_SUMMONER], results[OWNED_CHAMPIONS]
+        account = (summoner or {}).get('puuid')
+        if not account or owned is None:
+            return None
+
+        champions = owned_champion_ids(owned)
+        with self._lock:
+            self._data["last_account"] = account
+            self._data["accounts"][account] = {"champions": champions}
+            self._save()
+        logger.debug(f"Champion catalog refreshed: {len(champions)} owned")
+        return champions
@@ -0,0 +1,18 @@
+import asyncio
+import time
+
+
+class WallClock:
+    """The clock champ select timers are read against: the wall clock in
+    epoch milliseconds, the same one as the session timer's
+    ``internalNowInEpochMs``. A replay swaps it for a ``ReplayClock``."""
+
+    def now_ms(self) -> float:
+        return time.time() * 1000
+
+    async def wait(self, event: asyncio.Event, delay_ms: float):
+        """Return once ``event`` is set or ``delay_ms`` has passed."""
+        try:
+            await asyncio.wait_for(event.wait(), delay_ms / 1000)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+ALL_EVENT_TYPES = ('CREATE', 'UPDATE', 'DELETE')
+
+
+class _Channel:
+    """Queue of events for one registered handler, drained by one task.
+
+    lcu-driver starts a task per event, so a burst of updates would run the
+    handler that many times, interleaved at every await. Here events are
+    queued instead and handled one at a time. An UPDATE that arrives while
+    an UPDATE of the same URI is still queued replaces it. The handler only
+    sees the newest state, and CREATE/DELETE keep their order around it.
+    Outside its gameflow ``phases`` (None: all) the channel is inactive and
+    drops events.
+    """
+
+    def __init__(self, uri, event_types, handler, phases=None):
+        self.uri = uri
+        self.event_types = event_types
+        self.phases = phases
+        self.active = True
+        self._handler = handler
+        self._pending = deque()
+        self._task = None
+        self.received = 0
+        self.processed = 0
+
+    async def on_event(self, connection, event):
+        if not self.active:
+            return
+        self.received += 1
+        if (event.type == 'Update' and self._pending
+                and self._pending[-1][1].type == 'Update' and self._pending[-1][1].uri == event.uri):
+            self._pending[-1] = (connection, event)
+        else:
+            self._pending.append((connection, event))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while self._pending:
+            connection, event = self._pending.popleft()
+            try:
+                await self._handler(connection, event)
+            except Exception as e:
+                logger.error(f"Error handling {event.type} {event.uri}: {e}")
+            self.processed += 1
+
+    def reset(self):
+        self._pending.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class CoalescingEventManager:
+    """Drop-in for lcu-driver's ``connector.ws`` that coalesces events.
+
+    Handlers ``register()`` here once; the lcu-driver connector is wired up
+    with ``attach()``. Each handler then sees its URI's events in
+    order, with bursts of UPDATEs collapsed to the latest (see ``_Channel``).
+    """
+
+    def __init__(self):
+        self._channels = []
+
+    def register(self, uri: str, *, event_types=ALL_EVENT_TYPES, phases=None):
+        """Same as lcu-driver's ``ws.register``. With ``phases`` (gameflow
+        phase names) the handler is only subscribed during those phases."""
+        if not uri.startswith('/'):
+            raise RuntimeError('every endpoint should start with a forward slash')
+
+        def register_wrapper(coro_func):
+            if not asyncio.iscoroutinefunction(coro_func):
+                raise TypeError("Annotated functions should be coroutines. Use 'async def'.")
+            self._channels.append(_Channel(uri, tuple(event_types), coro_func, phases and tuple(phases)))
+            return coro_func
+        return register_wrapper
+
+    def attach(self, connector):
+        """Route ``connector``'s WebSocket events through the channels."""
+        for channel in self._channels:
+            connector.ws.register(channel.uri, event_types=channel.event_types)(channel.on_event)
+
+    def set_phase(self, phase) -> list:
+        """(De)activate channels for a gameflow phase (None: unknown, all
+        active). Returns the channels that just became active."""
+        activated = []
+        for channel in self._channels:
+            active = phase is None or channel.phases is None or phase in channel.phases
+            if active and not channel.active:
+                activated.append(channel)
+            elif channel.active and not active:
+                channel.reset()
+            channel.active = active
+        return activated
+
+    def active_uris(self) -> list:
+        return [channel.uri for channel in self._channels if channel.active]
+
+    def reset(self):
+        """Drop queued events (they belong to a previous connection)."""
+        for channel in self._channels:
+            channel.reset()
+
+    async def join(self):
+        """Wait until every queued event has been handled."""
+        while True:
+            tasks = [channel._task for channel in self._channels if channel._task and not channel._task.done()]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """{uri: (events received, events handled)} since start."""
+        stats = {}
+        for channel in self._channels:
+            received, processed = stats.get(channel.uri, (0, 0))
+            stats[channel.uri] = (received + channel.received, processed + channel.processed)
+        return stats
@@ -1,49 +1,97 @@
-import os
 import logging
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from .lockfile import LockfileWatcher
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to the client; also the number of concurrent GETs
+# get_many() runs
+POOL_SIZE = 4
+REQUEST_TIMEOUT_SEC = 5
+
+
+def _lcu_ssl_context() -> ssl.SSLContext:
+    # The client serves a self-signed certificate for 127.0.0.1
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+OWNED_CHAMPIONS = '/lol-champions/v1/owned-champions-minimal'
+
+
+def owned_champion_ids(data) -> dict:
+    """{name: id} of the owned champions in an owned-champions-minimal response"""
+    if not data:
+        return {}
+    return {champ['name']: champ['id'] for champ in data if champ.get('ownership', {}).get('owned', False)}
+
+
+class _LCUAdapter(HTTPAdapter):
+    """Keep-alive pool that reuses one SSL context for every connection."""
+
+    def __init__(self, ssl_context, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
 
 class LCUApi:
-    """Synchronous LCU API client for fetching data from the League Client"""
+    """Synchronous LCU API client for fetching data from the League Client.
 
-    LOCKFILE_PATHS = [
-        os.path.expandvars(r"%LOCALAPPDATA%\Riot Games\League of Legends\lockfile"),
-        os.path.expandvars(r"C:\Riot Games\League of Legends\lockfile"),
-    ]
+    Requests go through one keep-alive session, so only the first call pays
+    for the TCP and TLS handshakes. Before each request the lockfile is
+    stat'ed; when the client restarts (new port and password) the client
+    rebinds and drops the stale connections.
+    """
 
-    def __init__(self):
+    def __init__(self, lockfile=None):
+        self._lockfile = lockfile or LockfileWatcher()
+        self._lock = threading.Lock()
+        self._bound = None
         self.base_url = None
         self.auth = None
+        self._executor = None
+
+        self._session = requests.Session()
+        # Localhost only: skip per-request proxy/netrc/CA-bundle env lookups,
+        # which would also override verify=False with REQUESTS_CA_BUNDLE
+        self._session.trust_env = False
+        self._session.verify = False
+        adapter = _LCUAdapter(_lcu_ssl_context(), pool_connections=1, pool_maxsize=POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._connect()
 
     def _connect(self):
-        """Try to connect to the LCU by reading the lockfile"""
-        lockfile_path = None
-        for path in self.LOCKFILE_PATHS:
-            if os.path.exists(path):
-                lockfile_path = path
-                break
-
-        if not lockfile_path:
-            logger.debug("LCU lockfile not found")
-            return
-
-        try:
-            with open(lockfile_path, 'r') as f:
-                content = f.read()
-            parts = content.split(':')
-            if len(parts) >= 5:
-                port = parts[2]
-                password = parts[3]
-                self.base_url = f"https://127.0.0.1:{port}"
-                self.auth = ('riot', password)
-                logger.debug(f"LCU API connected on port {port}")
-        except Exception as e:
-            logger.error(f"Failed to read LCU lockfile: {e}")
+        """Bind to the client described by the lockfile, if it changed"""
+        info = self._lockfile.current()
+        with self._lock:
+            if info == self._bound:
+                return
+            self._bound = info
+            if info is None:
+                self.base_url = None
+                self.auth = None
+            else:
+                self.base_url = info.base_url
+                self.auth = ('riot', info.password)
+                logger.debug(f"LCU API connected on port {info.port}")
+            # Pooled connections point at the old client
+            self._session.close()
 
     def is_connected(self):
+        self._connect()
         return self.base_url is not None
 
     def get(self, endpoint):
@@ -51,21 +99,37 @@ class LCUApi:
         if not self.is_connected():
             return None
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}{endpoint}",
                 auth=self.auth,
-                verify=False,
-                timeout=5
+                timeout=REQUEST_TIMEOUT_SEC
             )
             if response.status_code == 200:
                 return response.json()
+        except requests.ConnectionError as e:
+            # Client may have restarted within the lockfile's mtime granularity
+            self._lockfile.invalidate()
+            logger.debug(f"LCU API request failed: {e}")
         except Exception as e:
             logger.debug(f"LCU API request failed: {e}")
         return None
 
+    def get_many(self, endpoints) -> dict:
+        """GET several endpoints concurrently over the pooled connections.
+        Returns {endpoint: data or None}."""
+        endpoints = list(endpoints)
+        if not self.is_connected():
+            return dict.fromkeys(endpoints)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="lcu-api")
+        return dict(zip(endpoints, self._executor.map(self.get, endpoints)))
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._session.close()
+
     def get_owned_champions(self):
         """Fetch list of owned champions"""
-        data = self.get('/lol-champions/v1/owned-champions-minimal')
-        if data:
-            return {champ['name']: champ['id'] for champ in data if champ.get('ownership', {}).get('owned', False)}
-        return {}
+        return owned_champion_ids(self.get(OWNED_CHAMPIONS))
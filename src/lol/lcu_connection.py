@@ -0,0 +1,141 @@
+import asyncio
+import logging
+
+import aiohttp
+import psutil
+from lcu_driver import Connector
+from lcu_driver.connection import Connection
+from lcu_driver.utils import _return_ux_process
+
+from .lcu_frames import EventRouter
+from .lockfile import LockfileWatcher
+
+logger = logging.getLogger(__name__)
+
+# The LCU's WAMP topic carrying every API event; per-endpoint topics are
+# this plus the URI with '/' replaced by '_'
+ALL_EVENTS_TOPIC = 'OnJsonApiEvent'
+# WAMP 1 message types
+WAMP_SUBSCRIBE = 5
+WAMP_UNSUBSCRIBE = 6
+# Same cap lcu-driver uses
+MAX_WS_MSG_SIZE = 8 * 1024 * 1024
+# Between checks whether a just started client serves its API yet
+API_READY_RETRY_SEC = 0.1
+
+
+def event_topics(uris) -> list:
+    """The WAMP topics that deliver the events for ``uris``.
+
+    A URI ending in '/' (lcu-driver's prefix match) can't be expressed as a
+    topic, so it needs the firehose."""
+    topics = set()
+    for uri in uris:
+        if uri.endswith('/'):
+            return [ALL_EVENTS_TOPIC]
+        topics.add(ALL_EVENTS_TOPIC + uri.replace('/', '_'))
+    return sorted(topics)
+
+
+class LCUConnection(Connection):
+    """lcu-driver connection that subscribes only to the events its
+    connector's handlers registered for.
+
+    lcu-driver subscribes to ``OnJsonApiEvent``, so every event the client
+    emits (chat, presence, patcher, ...) is received and JSON-decoded before
+    its URI is even looked at. Here frames are matched on their raw text
+    and payloads are decoded only when a handler reads them.
+    """
+
+    def __init__(self, connector, process_or_string):
+        super().__init__(connector, process_or_string)
+        self._topics = set()
+        self._wanted_topics = None
+
+    async def subscribe(self, uris):
+        """Change the subscriptions to just the topics for ``uris``; applied
+        once the WebSocket is up if it isn't yet."""
+        self._wanted_topics = set(event_topics(uris))
+        if self._ws is not None and not self._ws.closed:
+            await self._sync_topics()
+
+    async def _sync_topics(self):
+        wanted = self._wanted_topics
+        added, removed = sorted(wanted - self._topics), sorted(self._topics - wanted)
+        self._topics = set(wanted)
+        for topic in added:
+            await self._ws.send_json([WAMP_SUBSCRIBE, topic])
+        for topic in removed:
+            await self._ws.send_json([WAMP_UNSUBSCRIBE, topic])
+        if added or removed:
+            logger.debug(f"Subscribed to {', '.join(sorted(wanted))}")
+
+    async def _wait_api_ready(self):
+        # lcu-driver retries in a tight loop, with a new session per attempt
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.get(f'{self.address}/riotclient/region-locale', ssl=False):
+                        return
+                except aiohttp.ClientConnectorError:
+                    await asyncio.sleep(API_READY_RETRY_SEC)
+
+    async def run_ws(self):
+        registrations = self._connector.ws.registered_uris
+        router = EventRouter(registrations)
+        if self._wanted_topics is None:
+            self._wanted_topics = set(event_topics(reg['uri'] for reg in registrations))
+        local_session = aiohttp.ClientSession(auth=aiohttp.BasicAuth('riot', self._auth_key),
+                                              headers=self._headers)
+        try:
+            self._ws = await local_session.ws_connect(self.ws_address, ssl=False, max_msg_size=MAX_WS_MSG_SIZE)
+            await self._sync_topics()
+
+            while not self.closed:
+                msg = await self._ws.receive()
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    try:
+                        event = router.parse(msg.data)
+                    except ValueError:
+                        logger.warning(f"Error decoding LCU WebSocket frame: {msg.data[:200]}")
+                        continue
+                    if event is not None:
+                        if self._connector.recorder is not None:
+                            self._connector.recorder.record(event)
+                        for handler in router.handlers(event):
+                            asyncio.create_task(handler(self, event))
+                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+            await self._ws.close()
+        finally:
+            await local_session.close()
+
+
+class LCUConnector(Connector):
+    """lcu-driver ``Connector`` for ``LCUConnection``s; the caller attaches
+    connections to it (see ``SharedLCUConnector``) instead of ``start()``.
+
+    The client is found through its lockfile, which only costs a stat and a
+    small read. lcu-driver's own discovery (walking every process's command
+    line, which takes seconds on a busy machine) is only the fallback when
+    there's no lockfile for a live client.
+    """
+
+    def __init__(self, *, loop=None, lockfile=None):
+        super().__init__(loop=loop)
+        self._lockfile = lockfile or LockfileWatcher()
+        # EventRecorder the connections hand routed events to, if recording
+        self.recorder = None
+
+    def find_client(self):
+        """Lockfile string or process for ``LCUConnection``, or None."""
+        info = self._lockfile.current()
+        # A crashed client leaves its lockfile behind
+        if info is not None and psutil.pid_exists(info.pid):
+            logger.debug(f"LCU found via lockfile on port {info.port}")
+            # lcu-driver's lockfile form: "<client pid>:<pid>:<port>:<password>"
+            return f"{info.pid}:{info.pid}:{info.port}:{info.password}"
+        process = next(_return_ux_process(), None)
+        if process is not None:
+            logger.debug("LCU found via process scan")
+        return process
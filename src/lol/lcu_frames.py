@@ -0,0 +1,100 @@
+import json
+import re
+
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = 'orjson'
+except ImportError:
+    _loads = json.loads
+    JSON_BACKEND = 'json'
+
+# The client serializes event frames as
+#   [8,"<topic>",{"data":<payload>,"eventType":"Update","uri":"/lol-..."}]
+# so the event type and URI sit in a fixed tail after the payload
+_DATA_PREFIX = '",{"data":'
+_TAIL_START = ',"eventType":"'
+_TAIL_RE = re.compile(r',"eventType":"(\w+)","uri":"([^"\\]*)"\}\]\s*$')
+
+
+def decode(text):
+    """json.loads, or orjson's if it's installed. Raises ValueError."""
+    return _loads(text)
+
+
+def split_event_frame(frame: str):
+    """(event type, uri, raw JSON payload) of a WAMP event frame, found
+    without parsing the payload; None if the frame isn't laid out as
+    expected (the caller should decode it in full)."""
+    if not frame.startswith('[8,"'):
+        return None
+    data_start = frame.find(_DATA_PREFIX, 4)
+    tail_start = frame.rfind(_TAIL_START)
+    if data_start < 0 or tail_start < data_start:
+        return None
+    tail = _TAIL_RE.match(frame, tail_start)
+    if tail is None:
+        return None
+    return tail.group(1), tail.group(2), frame[data_start + len(_DATA_PREFIX):tail_start]
+
+
+class LCUEvent:
+    """An LCU WebSocket event, with the same attributes as lcu-driver's
+    ``WebsocketEventResponse``. ``data`` is only decoded when first read, so
+    events that are dropped (e.g. coalesced away) never pay for it."""
+    __slots__ = ('type', 'uri', '_raw', '_data')
+
+    def __init__(self, event_type, uri, raw=None, data=None):
+        self.type = event_type
+        self.uri = uri
+        self._raw = raw
+        self._data = data
+
+    def raw_data(self) -> str:
+        """The payload as JSON text, without decoding it if it wasn't yet."""
+        return self._raw if self._raw is not None else json.dumps(self._data)
+
+    @property
+    def data(self):
+        if self._raw is not None:
+            self._data = decode(self._raw)
+            self._raw = None
+        return self._data
+
+
+class EventRouter:
+    """Matches frames against registrations (lcu-driver's
+    ``ws.registered_uris``: exact URIs, or prefixes ending in '/')."""
+
+    def __init__(self, registrations):
+        self._registrations = list(registrations)
+        self._exact = {reg['uri'] for reg in self._registrations if not reg['uri'].endswith('/')}
+        self._prefixes = tuple(reg['uri'] for reg in self._registrations if reg['uri'].endswith('/'))
+
+    def wants(self, uri: str) -> bool:
+        return uri in self._exact or uri.startswith(self._prefixes)
+
+    def parse(self, frame: str) -> LCUEvent | None:
+        """The event in ``frame`` if any registration wants it. Frames for
+        other URIs are rejected from the raw text, without decoding them."""
+        parts = split_event_frame(frame)
+        if parts is not None:
+            event_type, uri, raw = parts
+            return LCUEvent(event_type, uri, raw=raw) if self.wants(uri) else None
+
+        message = decode(frame)
+        if not isinstance(message, list) or len(message) < 3 or message[0] != 8:
+            return None
+        event = message[2]
+        if not self.wants(event.get('uri', '')):
+            return None
+        return LCUEvent(event.get('eventType'), event.get('uri'), data=event.get('data'))
+
+    def handlers(self, event: LCUEvent):
+        """Handlers registered for ``event``'s URI and type."""
+        event_type = (event.type or '').upper()
+        for reg in self._registrations:
+            uri = reg['uri']
+            if (uri == event.uri or (uri.endswith('/') and event.uri.startswith(uri))) \
+                    and event_type in reg['event_types']:
+                yield reg['coroutine_or_callable']
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+from .clock import WallClock
+
+logger = logging.getLogger(__name__)
+
+# Lock this long before the phase ends on top of the measured round trip,
+# for the client to apply the lock before its own timer runs out
+LOCK_SAFETY_MARGIN_MS = 750
+# Round trip assumed until the first PATCH has been timed
+INITIAL_RTT_MS = 250
+# Smoothing gains of the round trip mean and deviation (as TCP's RTO, RFC 6298)
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+
+
+class RttEstimator:
+    """Smoothed round trip of champ select PATCHes, from request to response
+    (including any event loop lag before the request went out)."""
+
+    def __init__(self):
+        self.srtt_ms = INITIAL_RTT_MS
+        self.rttvar_ms = INITIAL_RTT_MS / 2
+        self._measured = False
+
+    def add_sample(self, rtt_ms: float):
+        if not self._measured:
+            self._measured = True
+            self.srtt_ms = rtt_ms
+            self.rttvar_ms = rtt_ms / 2
+        else:
+            self.rttvar_ms += RTT_BETA * (abs(self.srtt_ms - rtt_ms) - self.rttvar_ms)
+            self.srtt_ms += RTT_ALPHA * (rtt_ms - self.srtt_ms)
+        logger.debug(f"LCU PATCH took {rtt_ms:.0f} ms (srtt {self.srtt_ms:.0f} ms, rttvar {self.rttvar_ms:.0f} ms)")
+
+    @property
+    def timeout_ms(self) -> float:
+        """A round trip we don't expect to exceed."""
+        return self.srtt_ms + 4 * self.rttvar_ms
+
+
+class LockScheduler:
+    """Runs ``lock()`` (a coroutine function) at the latest moment that
+    still beats the end of the pick phase.
+
+    The deadline is the epoch time the session timer says the phase ends, so
+    however late an event is handled the lock time doesn't drift. Calling
+    ``schedule()`` again (on every session update) moves the pending lock
+    instead of starting another one; the margin kept before the deadline
+    grows and shrinks with the measured PATCH round trip.
+
+    Deadlines are read against ``clock`` (a ``WallClock`` by default).
+    """
+
+    def __init__(self, lock, clock=None):
+        self.rtt = RttEstimator()
+        self._lock = lock
+        self._clock = clock or WallClock()
+        self._task = None
+        self._lock_at_ms = None
+        self._rescheduled = None
+
+    @property
+    def margin_ms(self) -> float:
+        return LOCK_SAFETY_MARGIN_MS + self.rtt.timeout_ms
+
+    def schedule(self, phase_ends_at_ms: float):
+        """Lock ``margin_ms`` before ``phase_ends_at_ms``. Must be called from
+        the event loop."""
+        lock_at_ms = phase_ends_at_ms - self.margin_ms
+        if self._task and not self._task.done():
+            if lock_at_ms != self._lock_at_ms:
+                self._lock_at_ms = lock_at_ms
+                self._rescheduled.set()
+            return
+
+        self._lock_at_ms = lock_at_ms
+        self._rescheduled = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.debug(f"Scheduling auto-lock in {(lock_at_ms - self._clock.now_ms()) / 1000:.1f}s")
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            logger.debug("Cancelled auto-lock timer")
+        self._task = None
+
+    async def _run(self):
+        started_ms = self._clock.now_ms()
+        try:
+            while True:
+                delay_ms = self._lock_at_ms - self._clock.now_ms()
+                if delay_ms <= 0:
+                    break
+                self._rescheduled.clear()
+                await self._clock.wait(self._rescheduled, delay_ms)
+
+            # Timed from when the lock was due, so loop lag counts too
+            due_ms = max(self._lock_at_ms, started_ms)
+            if await self._lock():
+                self.rtt.add_sample(self._clock.now_ms() - due_ms)
+        except asyncio.CancelledError:
+            logger.debug("Auto-lock timer was cancelled")
@@ -0,0 +1,106 @@
+import logging
+import os
+import re
+import threading
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+LOCKFILE_PATHS = [
+    os.path.expandvars(r"%LOCALAPPDATA%\Riot Games\League of Legends\lockfile"),
+    os.path.expandvars(r"C:\Riot Games\League of Legends\lockfile"),
+]
+
+# The Riot Client records where League is installed here, also for custom
+# install dirs
+PRODUCT_SETTINGS_PATH = os.path.expandvars(
+    r"%PROGRAMDATA%\Riot Games\Metadata\league_of_legends.live\league_of_legends.live.product_settings.yaml"
+)
+_INSTALL_PATH_RE = re.compile(r'^\s*product_install_full_path:\s*"?([^"\r\n]+?)"?\s*$', re.MULTILINE)
+
+
+def lockfile_paths() -> list:
+    """Where the lockfile may be: the install dir the Riot Client recorded,
+    then the default locations."""
+    paths = []
+    try:
+        with open(PRODUCT_SETTINGS_PATH, 'r', encoding='utf-8') as f:
+            match = _INSTALL_PATH_RE.search(f.read())
+        if match:
+            paths.append(os.path.join(os.path.normpath(match.group(1)), 'lockfile'))
+    except OSError:
+        pass
+    for path in LOCKFILE_PATHS:
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+class LockfileInfo(NamedTuple):
+    """Contents of the League client's lockfile: ``name:pid:port:password:protocol``."""
+    pid: int
+    port: int
+    password: str
+    protocol: str
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.protocol}://127.0.0.1:{self.port}"
+
+
+def read_lockfile(path: str) -> LockfileInfo | None:
+    try:
+        with open(path, 'r') as f:
+            content = f.read()
+    except OSError as e:
+        logger.debug(f"Failed to read LCU lockfile {path}: {e}")
+        return None
+    parts = content.strip().split(':')
+    if len(parts) < 5:
+        return None
+    try:
+        return LockfileInfo(int(parts[1]), int(parts[2]), parts[3], parts[4])
+    except ValueError:
+        return None
+
+
+class LockfileWatcher:
+    """Tracks the lockfile the client rewrites each time it starts.
+
+    ``current()`` only stats the candidate paths; the file is re-read when
+    its (path, size, mtime) changes, so callers can check it before every
+    request and rebind as soon as the client restarts on a new port.
+    """
+
+    def __init__(self, paths=None):
+        self._paths = list(paths or lockfile_paths())
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._info = None
+
+    def _stat(self):
+        for path in self._paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return path, st.st_size, st.st_mtime_ns
+        return None
+
+    def current(self) -> LockfileInfo | None:
+        stamp = self._stat()
+        with self._lock:
+            if stamp != self._stamp:
+                self._stamp = stamp
+                self._info = read_lockfile(stamp[0]) if stamp else None
+                if self._info:
+                    logger.debug(f"LCU lockfile: port {self._info.port}")
+                else:
+                    logger.debug("LCU lockfile not found")
+            return self._info
+
+    def invalidate(self):
+        """Force a re-read on the next ``current()`` (e.g. after a
+        connection error the stat didn't explain)."""
+        with self._lock:
+            self._stamp = None
@@ -0,0 +1,250 @@
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import time
+
+from lcu_driver.events.managers import WebsocketEventManager
+
+from .lcu_frames import EventRouter, LCUEvent, decode
+
+logger = logging.getLogger(__name__)
+
+# How far past the last event a replay on a ReplayClock runs pending
+# timers: longer than any champ select phase
+REPLAY_TAIL_MS = 5 * 60 * 1000
+# Event loop passes a ReplayClock gives woken tasks to run
+SETTLE_PASSES = 10
+
+
+class EventRecorder:
+    """Appends the WebSocket events handlers subscribed to to a gzipped JSONL
+    file, one ``{"t": seconds since start, "type", "uri", "data"}`` per line.
+
+    ``t`` is monotonic. Payloads are copied as the raw JSON text the client
+    sent, so recording doesn't force a decode.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._started = time.monotonic()
+        self.count = 0
+        logger.info(f"Recording LCU events to {path}")
+
+    def record(self, event: LCUEvent):
+        t = time.monotonic() - self._started
+        head = json.dumps({'t': round(t, 6), 'type': event.type, 'uri': event.uri})
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(f'{head[:-1]}, "data": {event.raw_data()}}}\n')
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Recorded {self.count} LCU events to {self._path}")
+
+
+def read_recording(path):
+    """Yield (t, LCUEvent) for each event in a recording."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = decode(line)
+            yield record['t'], LCUEvent(record['type'], record['uri'], data=record['data'])
+
+
+class ReplayResponse:
+    """Enough of aiohttp's ClientResponse for the handlers."""
+
+    def __init__(self, status, data=None):
+        self.status = status
+        self._data = data
+
+    async def json(self):
+        return self._data
+
+    def release(self):
+        pass
+
+
+class ReplayConnection:
+    """Stands in for the lcu-driver connection during a replay.
+
+    Outgoing requests are recorded in ``requests`` as (seconds into the
+    replay, method, endpoint, data) and never sent anywhere. A GET answers
+    with the latest replayed state of that URI (404 if none), like the
+    client's REST view of the same resources.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self.requests = []
+        self.resources = {}
+        self._started = time.monotonic()
+
+    async def request(self, method, endpoint, **kwargs):
+        self.requests.append((time.monotonic() - self._started, method.upper(), endpoint, kwargs.get('data')))
+        if method.lower() == 'get':
+            if endpoint in self.resources:
+                return ReplayResponse(200, self.resources[endpoint])
+            return ReplayResponse(404, {'httpStatus': 404})
+        return ReplayResponse(204)
+
+    async def subscribe(self, uris):
+        pass
+
+
+class _ReplayConnector:
+    """Collects the registrations ``CoalescingEventManager.attach()`` makes."""
+
+    def __init__(self):
+        self.ws = WebsocketEventManager()
+
+
+class ReplayClock:
+    """A ``WallClock`` stand-in that only moves when ``replay()`` advances
+    it, to the recorded time of each event.
+
+    Pass the same instance to the handlers (e.g. ``LoLAutoPick(settings,
+    clock=clock)``) and to ``replay()``: a lock that was due between two
+    events, or after the last one, then fires at its recorded moment
+    without the replay waiting for it.
+    """
+
+    def __init__(self):
+        self._now_ms = 0.0
+        # [due at, future] of every pending wait()
+        self._timers = []
+
+    def now_ms(self) -> float:
+        return self._now_ms
+
+    async def wait(self, event: asyncio.Event, delay_ms: float):
+        timer = [self._now_ms + delay_ms, asyncio.get_running_loop().create_future()]
+        self._timers.append(timer)
+        set_task = asyncio.create_task(event.wait())
+        try:
+            await asyncio.wait((timer[1], set_task), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            set_task.cancel()
+            self._timers.remove(timer)
+
+    def next_timer_ms(self) -> float | None:
+        """When the earliest pending wait() is due, None if there's none."""
+        return min((due_ms for due_ms, woken in self._timers if not woken.done()), default=None)
+
+    async def advance(self, to_ms: float):
+        """Move the clock to ``to_ms``, waking the waits due on the way in
+        order and letting what they started run before moving on."""
+        while True:
+            due_ms = self.next_timer_ms()
+            if due_ms is None or due_ms > to_ms:
+                break
+            self._now_ms = max(self._now_ms, due_ms)
+            for timer_due_ms, woken in self._timers:
+                if timer_due_ms <= self._now_ms and not woken.done():
+                    woken.set_result(None)
+            await _settle()
+        self._now_ms = max(self._now_ms, to_ms)
+
+
+async def _settle():
+    # A woken task runs until it awaits something that isn't ready; the
+    # replay connection answers at once, so a few loop passes see a lock
+    # (and whatever it schedules) through
+    for _ in range(SETTLE_PASSES):
+        await asyncio.sleep(0)
+
+
+def _timer_epoch(data):
+    """A payload's ``timer.internalNowInEpochMs``, None if it has none."""
+    timer = data.get('timer') if isinstance(data, dict) else None
+    return timer.get('internalNowInEpochMs') if isinstance(timer, dict) else None
+
+
+def _shift_timer(data, offset_ms):
+    """Move a payload's ``timer.internalNowInEpochMs`` (the client's wall
+    clock, e.g. in the champ select session) by ``offset_ms``; returns the
+    offset to use, computed from this timer if ``offset_ms`` is None."""
+    stamped_at = _timer_epoch(data)
+    if stamped_at is None:
+        return offset_ms
+    if offset_ms is None:
+        offset_ms = time.time() * 1000 - stamped_at
+    data['timer']['internalNowInEpochMs'] += offset_ms
+    return offset_ms
+
+
+async def replay(path, ws_manager, realtime=False, speed=1.0, settle_sec=0.1,
+                 clock: ReplayClock | None = None) -> ReplayConnection:
+    """Feed a recording to the handlers registered on ``ws_manager`` (a
+    ``CoalescingEventManager``, e.g. ``SharedLCUConnector.ws``).
+
+    With ``realtime`` events are spaced as recorded (divided by ``speed``),
+    and recorded timer epochs are shifted so the first one reads as the
+    moment it's replayed: handlers that compare them with the wall clock
+    (the auto-lock deadline) act as they did live.
+
+    Otherwise events are dispatched as fast as the handlers take them,
+    which is deterministic as handlers only talk to the returned
+    ``ReplayConnection``. Timed behaviour then needs ``clock``, the
+    ``ReplayClock`` the handlers were built with: it's advanced to each
+    event's recorded time, and after the last event through the timers
+    still pending (for up to ``REPLAY_TAIL_MS``). Without it the timer
+    epochs are shifted as in realtime mode, and a lock only goes out if it
+    was already due when the last event was handled.
+
+    Returns once every event has been handled, and other tasks the
+    handlers started had ``settle_sec`` (of real time) to finish.
+    """
+    if realtime and clock is not None:
+        raise ValueError("A realtime replay runs on the wall clock")
+    connector = _ReplayConnector()
+    ws_manager.attach(connector)
+    router = EventRouter(connector.ws.registered_uris)
+    connection = ReplayConnection()
+    started = time.monotonic()
+    offset_ms = None
+    # Epoch time of the start of the recording, from the first timer
+    clock_origin_ms = None
+    replayed_to_ms = None
+
+    for t, event in read_recording(path):
+        if realtime:
+            delay = t / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if clock is None:
+            offset_ms = _shift_timer(event.data, offset_ms)
+        else:
+            stamped_at = _timer_epoch(event.data)
+            if clock_origin_ms is None and stamped_at is not None:
+                clock_origin_ms = stamped_at - t * 1000
+            if clock_origin_ms is not None:
+                replayed_to_ms = clock_origin_ms + t * 1000
+                await clock.advance(replayed_to_ms)
+        if event.type == 'Delete':
+            connection.resources.pop(event.uri, None)
+        else:
+            connection.resources[event.uri] = event.data
+        for handler in router.handlers(event):
+            await handler(connection, event)
+        # Let the drain tasks the channels just started run
+        await asyncio.sleep(0)
+
+    await ws_manager.join()
+    if replayed_to_ms is not None:
+        await _settle()
+        await clock.advance(replayed_to_ms + REPLAY_TAIL_MS)
+    others = asyncio.all_tasks() - {asyncio.current_task()}
+    if others:
+        await asyncio.wait(others, timeout=settle_sec)
+    return connection
@@ -1,44 +1,79 @@
 import logging
 import asyncio
-import ctypes
-import time
 from threading import Thread
-from lcu_driver import Connector
 
-logger = logging.getLogger(__name__)
+from game_lifecycle import LOL_CLIENT
 
-# Windows API for fast window detection
-user32 = ctypes.windll.user32
+from .event_dispatch import CoalescingEventManager
+from .lcu_connection import LCUConnection, LCUConnector
+from .lcu_frames import LCUEvent
+from .recording import EventRecorder
 
+logger = logging.getLogger(__name__)
 
-def is_lol_client_running() -> bool:
-    """
-    Fast check if League Client is running using FindWindow.
-    Much faster than psutil process iteration (~0.01ms vs ~1700ms).
-    """
-    # RCLIENT is the window class for LeagueClientUx
-    hwnd = user32.FindWindowW("RCLIENT", None)
-    return hwnd != 0
+# How often the connector thread, while blocked on the lifecycle monitor,
+# re-checks whether it was stopped
+STOP_CHECK_SEC = 1.0
+# Between attempts to find a client whose window is up but that hasn't
+# written its lockfile or started its UX process yet
+CLIENT_RETRY_SEC = 0.5
+# How long stop() waits for the loop thread
+STOP_TIMEOUT_SEC = 3.0
+
+GAMEFLOW_PHASE = '/lol-gameflow/v1/gameflow-phase'
+# Phases in which a ready check can pop at any moment
+QUEUE_PHASES = ('Matchmaking', 'ReadyCheck')
+# While queued, touch the API this often so the connection handlers send on
+# stays open (aiohttp drops pooled connections idle for 15 s)
+PREWARM_INTERVAL_SEC = 10.0
+PREWARM_ENDPOINT = '/riotclient/region-locale'
 
 
 class SharedLCUConnector:
     """
     A single shared LCU connector that multiple handlers can register with.
-    Uses fast FindWindow detection instead of slow psutil polling.
+    Owns one asyncio loop thread and one lcu-driver connector for the app's
+    lifetime; a connection is attached when the game lifecycle monitor
+    reports the client's window, and detached when the client closes.
+
+    Handlers register WebSocket events on ``ws`` (same API as lcu-driver's
+    ``connector.ws``); bursts of UPDATEs for a URI are coalesced so each
+    handler only processes the newest state. The gameflow phase is tracked:
+    registrations made with ``phases=`` are only subscribed during those
+    phases, ``register_phase_callback()`` callbacks hear about changes, and
+    while queued the HTTP connection is kept warm for the ready-check
+    accept. The client is only asked for the events the active
+    registrations cover. With ``record_path`` those events are also
+    recorded for ``lol.recording.replay()``.
     """
 
-    def __init__(self):
+    def __init__(self, lifecycle, lockfile=None, record_path=None):
+        self._lifecycle = lifecycle
+        self._lockfile = lockfile
+        self._record_path = record_path
+        self._recorder = None
         self.connector = None
         self.loop = None
+        self._thread = None
+        self._main_task = None
         self.running = False
-        self._handlers = []
+        self.ws = CoalescingEventManager()
         self._ready_callbacks = []
         self._close_callbacks = []
+        self._phase_callbacks = []
         self._client_connected = False
+        self.gameflow_phase = None
+        # Phase events seen, so a slower GET of the phase doesn't undo one
+        self._phase_events = 0
+        self._prewarm_task = None
+        self.ws.register(GAMEFLOW_PHASE)(self._on_gameflow_phase)
 
     def register_handler(self, handler):
-        """Register a handler that will be called to set up its WebSocket subscriptions."""
-        self._handlers.append(handler)
+        """Let a handler set up its WebSocket subscriptions on ``ws``."""
+        try:
+            handler.register_ws_handlers(self)
+        except Exception as e:
+            logger.error(f"Error registering handler: {e}")
 
     def register_ready_callback(self, callback):
         """Register a callback to be called when LCU connects."""
@@ -48,102 +83,191 @@ class SharedLCUConnector:
         """Register a callback to be called when LCU disconnects."""
         self._close_callbacks.append(callback)
 
+    def register_phase_callback(self, callback):
+        """Register a callback to be called with (connection, phase) when the
+        gameflow phase changes (phase is None once the client disconnects)."""
+        self._phase_callbacks.append(callback)
+
+    async def _run_callbacks(self, callbacks, kind, *args):
+        for callback in callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(*args)
+                else:
+                    callback(*args)
+            except Exception as e:
+                logger.error(f"Error in {kind} callback: {e}")
+
+    async def _on_gameflow_phase(self, connection, event):
+        self._phase_events += 1
+        await self._set_phase(connection, None if event.type == 'Delete' else event.data)
+
+    async def _set_phase(self, connection, phase):
+        if phase == self.gameflow_phase:
+            return
+        logger.debug(f"Gameflow phase: {self.gameflow_phase} -> {phase}")
+        self.gameflow_phase = phase
+        activated = self.ws.set_phase(phase)
+        if not connection.closed:
+            await connection.subscribe(self.ws.active_uris())
+            await self._catch_up(connection, activated)
+        if phase in QUEUE_PHASES:
+            if self._prewarm_task is None or self._prewarm_task.done():
+                self._prewarm_task = asyncio.create_task(self._keep_warm(connection))
+        elif self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            self._prewarm_task = None
+        await self._run_callbacks(self._phase_callbacks, "phase", connection, phase)
+
+    async def _catch_up(self, connection, channels):
+        """Hand just subscribed handlers their resource's current state, in
+        case it changed before the subscription took."""
+        for channel in channels:
+            if channel.uri.endswith('/'):
+                continue
+            try:
+                response = await connection.request('get', channel.uri)
+                if response.status == 200:
+                    await channel.on_event(connection, LCUEvent('Update', channel.uri, data=await response.json()))
+                else:
+                    response.release()
+            except Exception as e:
+                logger.debug(f"Failed to catch up on {channel.uri}: {e}")
+
+    async def _keep_warm(self, connection):
+        """Keep a pooled connection to the client open while queued, so the
+        ready-check accept doesn't pay for a new TCP + TLS handshake."""
+        while not connection.closed:
+            try:
+                response = await connection.request('get', PREWARM_ENDPOINT)
+                response.release()
+            except Exception as e:
+                logger.debug(f"LCU pre-warm request failed: {e}")
+            await asyncio.sleep(PREWARM_INTERVAL_SEC)
+
     def start(self):
-        """Start the shared connector in a separate thread."""
+        """Start the shared connector's event loop in a separate thread."""
         if not self.running:
             self.running = True
-            thread = Thread(target=self._run_connector_loop, daemon=True)
-            thread.start()
+            self.loop = asyncio.new_event_loop()
+            self.connector = self._create_connector()
+            self._thread = Thread(target=self._run_loop, daemon=True)
+            self._thread.start()
             logger.info("Shared LCU connector thread started")
 
-    def _run_connector_loop(self):
+    def _create_connector(self):
+        """The one lcu-driver connector, with callbacks and handlers wired up
+        once; each client session attaches a connection to it."""
+        connector = LCUConnector(loop=self.loop, lockfile=self._lockfile)
+        if self._record_path:
+            try:
+                self._recorder = connector.recorder = EventRecorder(self._record_path)
+            except OSError as e:
+                logger.error(f"Cannot record LCU events to {self._record_path}: {e}")
+
+        @connector.ready
+        async def on_lcu_ready(connection):
+            self._client_connected = True
+            logger.info("LoL Client connected - shared connector active")
+            await self._run_callbacks(self._ready_callbacks, "ready", connection)
+            # Events only report changes; start from the current phase
+            try:
+                events_before = self._phase_events
+                response = await connection.request('get', GAMEFLOW_PHASE)
+                if response.status == 200:
+                    phase = await response.json()
+                    # A phase event while the GET was in flight is newer
+                    if self._phase_events == events_before:
+                        await self._set_phase(connection, phase)
+                else:
+                    response.release()
+            except Exception as e:
+                logger.debug(f"Failed to get gameflow phase: {e}")
+
+        @connector.close
+        async def on_lcu_close(connection):
+            self._client_connected = False
+            logger.info("LoL Client disconnected")
+            for uri, (received, processed) in self.ws.stats().items():
+                logger.debug(f"{uri}: {received} events received, {processed} processed")
+            await self._set_phase(connection, None)
+            await self._run_callbacks(self._close_callbacks, "close", connection)
+
+        self.ws.attach(connector)
+        return connector
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self._main_task = self.loop.create_task(self._run_sessions())
+            self.loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Connector error: {e}", exc_info=True)
+        finally:
+            # Handler tasks (coalesced dispatch, lock timers) still pending
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+
+    async def _run_sessions(self):
         """
-        Main loop that waits for LoL client using fast FindWindow,
-        then starts lcu-driver connector when client is detected.
+        Main loop that waits for the lifecycle monitor to report the LoL
+        client, then attaches a connection to it until the client closes.
         """
         while self.running:
             try:
-                # Phase 1: Wait for LoL client using fast FindWindow check
-                logger.debug("Waiting for LoL client (using FindWindow)...")
-                while self.running and not is_lol_client_running():
-                    time.sleep(2.0)  # Check every 2 seconds (very low CPU)
+                # Phase 1: Block (off the loop) until the client window appears
+                logger.debug("Waiting for LoL client...")
+                while self.running and not await asyncio.to_thread(
+                        self._lifecycle.wait_for, LOL_CLIENT, timeout=STOP_CHECK_SEC):
+                    pass
 
                 if not self.running:
                     break
 
-                logger.info("LoL client detected, starting connector...")
+                logger.info("LoL client detected, connecting...")
+
+                # Phase 2: Find the client (lockfile, else process scan)
+                client = await asyncio.to_thread(self.connector.find_client)
+                if not client:
+                    await asyncio.sleep(CLIENT_RETRY_SEC)
+                    continue
 
-                # Phase 2: Start lcu-driver connector (will quickly find the process)
-                self._run_connector()
+                # Phase 3: Run the session; returns when the client closes
+                self.ws.reset()
+                await LCUConnection(self.connector, client).init()
 
-                # Connector returned means client closed, loop back to wait
+                # Wait for its window to go too, so we don't reconnect to a
+                # client shutting down
                 if self.running:
-                    logger.debug("Connector stopped, will wait for client again")
-                    time.sleep(1.0)  # Brief pause before re-checking
+                    logger.debug("Connection closed, will wait for client again")
+                    await asyncio.to_thread(self._lifecycle.wait_for, LOL_CLIENT, running=False, timeout=5.0)
 
             except Exception as e:
                 logger.error(f"Error in connector loop: {e}", exc_info=True)
                 if self.running:
-                    time.sleep(5.0)  # Wait before retry on error
+                    await asyncio.sleep(5.0)  # Wait before retry on error
 
-    def _run_connector(self):
-        """Run the lcu-driver connector (blocks until client closes)."""
+    def stop(self, timeout=STOP_TIMEOUT_SEC):
+        """Stop the shared connector; safe to call from any thread. Waits up
+        to ``timeout`` seconds for the current session's close callbacks."""
+        if not self.running:
+            return
+        self.running = False
         try:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.connector = Connector()
-            self._client_connected = False
-
-            @self.connector.ready
-            async def on_lcu_ready(connection):
-                self._client_connected = True
-                logger.info("LoL Client connected - shared connector active")
-                for callback in self._ready_callbacks:
-                    try:
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(connection)
-                        else:
-                            callback(connection)
-                    except Exception as e:
-                        logger.error(f"Error in ready callback: {e}")
-
-            @self.connector.close
-            async def on_lcu_close(connection):
-                self._client_connected = False
-                logger.info("LoL Client disconnected")
-                for callback in self._close_callbacks:
-                    try:
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(connection)
-                        else:
-                            callback(connection)
-                    except Exception as e:
-                        logger.error(f"Error in close callback: {e}")
-
-            # Register all handlers
-            for handler in self._handlers:
-                try:
-                    handler.register_ws_handlers(self.connector)
-                except Exception as e:
-                    logger.error(f"Error registering handler: {e}")
-
-            logger.debug("Handlers registered, starting connector...")
-            self.connector.start()  # Blocks until client closes
-
-        except Exception as e:
-            logger.error(f"Connector error: {e}", exc_info=True)
-        finally:
-            self.connector = None
-            self.loop = None
-
-    def stop(self):
-        """Stop the shared connector."""
-        if self.running:
-            self.running = False
-            try:
-                if self.connector and self.loop and self.loop.is_running():
-                    asyncio.run_coroutine_threadsafe(self.connector.stop(), self.loop)
-                    self.loop.call_soon_threadsafe(self.loop.stop)
-                logger.info("Shared LCU connector stopped")
-            except Exception as e:
-                logger.error(f"Error stopping shared connector: {e}")
+            # Cancelling the session task closes the connection, which runs
+            # the close callbacks on the loop before it exits
+            self.loop.call_soon_threadsafe(self._main_task.cancel)
+        except RuntimeError:
+            pass  # Loop already closed
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Shared LCU connector did not stop within {timeout}s")
+        else:
+            logger.info("Shared LCU connector stopped")
+        if self._recorder:
+            self._recorder.close()
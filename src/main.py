@@ -44,11 +44,13 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="QOL-Scripts")
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
+    parser.add_argument('--record-lcu', metavar='PATH',
+                        help='Record League client events to PATH (gzipped JSONL) for replay')
     args = parser.parse_args()
 
     setup_logging(args.debug)
 
-    app = QOLApp()
+    app = QOLApp(record_lcu=args.record_lcu)
     try:
         app.run()
     except KeyboardInterrupt:
@@ -2,6 +2,7 @@ import re
 import sys
 import logging
 import tkinter as tk
+from threading import Thread
 from tkinter import ttk
 import win32gui
 import sv_ttk
@@ -9,7 +10,9 @@ import darkdetect
 import pywinstyles
 from PIL import ImageTk
 
+from lol.champion_catalog import ChampionCatalog
 from lol.lcu_api import LCUApi
+from settings import CONFIG_DIR
 from brightness import clean_window_title, get_cached_monitors
 from vibrance import get_displays
 
@@ -181,6 +184,11 @@ class AutocompleteCombobox(ttk.Entry):
         """Set current value"""
         self._var.set(value)
 
+    def set_values(self, values):
+        """Replace the autocomplete values"""
+        self._all_values = list(values)
+        self._filtered_values = self._all_values[:]
+
 
 def apply_theme_to_titlebar(root):
     version = sys.getwindowsversion()
@@ -217,19 +225,20 @@ class SettingsWindow:
         self.vibrance_games_list = sorted(self.settings.data.get("games_vibrance", []), key=str.lower)
         self.vibrance_display_vars = {}
 
+        # Champions come from the on-disk catalog so the window renders
+        # without waiting on the client; a background refresh swaps in the
+        # client's current list when it's reachable.
         self.lcu_api = LCUApi()
-        self.owned_champions = self.lcu_api.get_owned_champions() if self.lcu_api.is_connected() else {}
+        self.champion_catalog = ChampionCatalog(CONFIG_DIR / "champion_catalog.json")
+        self.owned_champions = self.champion_catalog.load()
         self.champion_id_to_name = {v: k for k, v in self.owned_champions.items()}
         self.champion_vars = {}
+        self.champion_combos = []
 
         self.create_widgets()
-        # Resize to natural content height so the window ends just under the
-        # tallest column instead of hard-coding a value.
-        self.root.update_idletasks()
-        content_height = self.root.winfo_reqheight()
-        self.root.geometry(f"880x{content_height}")
-        self.root.minsize(820, content_height)
+        self._fit_height()
         apply_theme_to_titlebar(self.root)
+        Thread(target=self._refresh_champions, daemon=True).start()
         # Bind cleanup to window close to avoid tkinter threading issues
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -638,9 +647,50 @@ class SettingsWindow:
         ).pack(side="left", padx=(5, 0))
 
         # Champion selection section
-        champs_frame = ttk.LabelFrame(right_col, text="Default Champions per Role", padding=10)
-        champs_frame.pack(fill="x", pady=(0, 10))
+        self.champs_frame = ttk.LabelFrame(right_col, text="Default Champions per Role", padding=10)
+        self.champs_frame.pack(fill="x", pady=(0, 10))
+
+        self._create_champion_rows()
+
+        # General section
+        general_frame = ttk.LabelFrame(left_col, text="General", padding=10)
+        general_frame.pack(fill="x", pady=(0, 10))
+
+        self.startup_var = tk.BooleanVar()
+        self.startup_var.set(self.app.is_startup_enabled() if self.app else False)
+        ttk.Checkbutton(
+            general_frame,
+            text="Start on Windows startup",
+            variable=self.startup_var
+        ).pack(anchor="w")
+
+        # Bottom buttons
+        btn_frame = ttk.Frame(main_container)
+        btn_frame.pack(fill="x", pady=(5, 0))
+
+        ttk.Button(
+            btn_frame,
+            text="Save",
+            command=self.save_settings,
+            width=12
+        ).pack(side="right")
+        ttk.Button(
+            btn_frame,
+            text="Cancel",
+            command=self._on_close,
+            width=12
+        ).pack(side="right", padx=(0, 5))
 
+    def _fit_height(self):
+        # Resize to natural content height so the window ends just under the
+        # tallest column instead of hard-coding a value.
+        self.root.update_idletasks()
+        content_height = self.root.winfo_reqheight()
+        self.root.geometry(f"880x{content_height}")
+        self.root.minsize(820, content_height)
+
+    def _create_champion_rows(self):
+        champs_frame = self.champs_frame
         if self.owned_champions:
             champion_names = ["None"] + sorted(self.owned_champions.keys())
 
@@ -675,6 +725,7 @@ class SettingsWindow:
                     width=13
                 )
                 primary_combo.pack(side="left", padx=(5, 0))
+                self.champion_combos.append(primary_combo)
 
                 # Secondary champion
                 secondary_var = tk.StringVar()
@@ -690,6 +741,7 @@ class SettingsWindow:
                     width=13
                 )
                 secondary_combo.pack(side="left", padx=(5, 0))
+                self.champion_combos.append(secondary_combo)
 
                 self.champion_vars[role_key] = {
                     'primary': primary_var,
@@ -702,34 +754,34 @@ class SettingsWindow:
                 foreground="gray"
             ).pack(anchor="w")
 
-        # General section
-        general_frame = ttk.LabelFrame(left_col, text="General", padding=10)
-        general_frame.pack(fill="x", pady=(0, 10))
-
-        self.startup_var = tk.BooleanVar()
-        self.startup_var.set(self.app.is_startup_enabled() if self.app else False)
-        ttk.Checkbutton(
-            general_frame,
-            text="Start on Windows startup",
-            variable=self.startup_var
-        ).pack(anchor="w")
-
-        # Bottom buttons
-        btn_frame = ttk.Frame(main_container)
-        btn_frame.pack(fill="x", pady=(5, 0))
-
-        ttk.Button(
-            btn_frame,
-            text="Save",
-            command=self.save_settings,
-            width=12
-        ).pack(side="right")
-        ttk.Button(
-            btn_frame,
-            text="Cancel",
-            command=self._on_close,
-            width=12
-        ).pack(side="right", padx=(0, 5))
+    def _refresh_champions(self):
+        """Background thread: fetch the current account's champions."""
+        try:
+            champions = self.champion_catalog.refresh(self.lcu_api)
+        except Exception as e:
+            logger.debug(f"Champion refresh failed: {e}")
+            return
+        if champions is None or champions == self.owned_champions:
+            return
+        try:
+            self.root.after(0, lambda: self._apply_champions(champions))
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed while we were fetching
+
+    def _apply_champions(self, champions):
+        """Swap in a fresh champion list, keeping the user's selections."""
+        self.owned_champions = champions
+        self.champion_id_to_name = {v: k for k, v in champions.items()}
+        if self.champion_combos:
+            champion_names = ["None"] + sorted(champions.keys())
+            for combo in self.champion_combos:
+                combo.set_values(champion_names)
+            return
+        # Nothing was cached: replace the placeholder with the role rows
+        for child in self.champs_frame.winfo_children():
+            child.destroy()
+        self._create_champion_rows()
+        self._fit_height()
 
     def save_settings(self):
         """Save current settings and close window"""
@@ -839,4 +891,5 @@ class SettingsWindow:
     def _on_close(self):
         """Handle window close - cleanup vars before destroying."""
         self._cleanup_vars()
+        self.lcu_api.close()
         self.root.destroy()
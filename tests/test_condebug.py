@@ -0,0 +1,49 @@
+from cs2.console_watcher import _ensure_condebug
+from cs2.localconfig_index import LocalConfigIndex
+
+from test_vdf import localconfig
+
+
+def index_of(tmp_path, data: bytes):
+    """A LocalConfigIndex over a Steam install whose only account's
+    localconfig.vdf is ``data``; returns (index, path)."""
+    config_dir = tmp_path / "userdata" / "1" / "config"
+    config_dir.mkdir(parents=True)
+    path = config_dir / "localconfig.vdf"
+    path.write_bytes(data)
+    index = LocalConfigIndex()
+    index.refresh(str(tmp_path))
+    return index, path
+
+
+def test_appends_to_launch_options_with_escaped_quotes(tmp_path):
+    app = b'\t\t\t\t\t"730"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LaunchOptions"\t\t"+exec \\"auto exec.cfg\\" -novid"\n\t\t\t\t\t}\n'
+    index, path = index_of(tmp_path, localconfig(app))
+
+    assert _ensure_condebug(index)
+
+    assert path.read_bytes() == localconfig(app.replace(b'-novid"', b'-novid -condebug"'))
+    assert index.launch_options(str(path)) == '+exec "auto exec.cfg" -novid -condebug'
+
+
+def test_inserts_missing_launch_options_at_the_block_indent(tmp_path):
+    app = b'\t\t\t\t\t"730"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LastPlayed"\t\t"1700000000"\n\t\t\t\t\t}\n'
+    index, path = index_of(tmp_path, localconfig(app))
+
+    assert _ensure_condebug(index)
+
+    assert path.read_bytes() == localconfig(
+        b'\t\t\t\t\t"730"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LastPlayed"\t\t"1700000000"\n'
+        b'\t\t\t\t\t\t"LaunchOptions"\t\t"-condebug"\n\t\t\t\t\t}\n')
+    assert index.launch_options(str(path)) == "-condebug"
+
+
+def test_leaves_file_alone_when_condebug_is_set(tmp_path):
+    data = localconfig(b'\t\t\t\t\t"730"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LaunchOptions"\t\t"-condebug -novid"\n\t\t\t\t\t}\n')
+    index, path = index_of(tmp_path, data)
+    mtime_ns = path.stat().st_mtime_ns
+
+    assert not _ensure_condebug(index)
+
+    assert path.read_bytes() == data
+    assert path.stat().st_mtime_ns == mtime_ns
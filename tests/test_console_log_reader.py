@@ -0,0 +1,53 @@
+from cs2.console_events import CONSOLE_EVENTS, MATCH_FOUND, ConsolePatternSet
+from cs2.console_watcher import MAX_LINE_BYTES, ConsoleLogReader
+
+MATCH_LINE = "[Client] CheckServerReservation: 1 @ =[A:1:123456789:27015] (reserved)"
+PATTERNS = ConsolePatternSet(CONSOLE_EVENTS)
+
+
+def reader_of(path, chunk_size=8, from_start=True):
+    return ConsoleLogReader(str(path), PATTERNS.prefilters, chunk_size=chunk_size, from_start=from_start)
+
+
+def append(path, text):
+    with open(path, "ab") as f:
+        f.write(text.encode())
+
+
+def test_line_split_across_two_writes_is_read_whole(tmp_path):
+    path = tmp_path / "console.log"
+    append(path, "[Client] Some other line\n" + MATCH_LINE[:30])
+    reader = reader_of(path)
+
+    assert list(reader.read_lines()) == []
+    append(path, MATCH_LINE[30:] + "\n")
+    lines = list(reader.read_lines())
+    reader.close()
+
+    assert lines == [MATCH_LINE]
+    assert PATTERNS.match(lines[0]).name == MATCH_FOUND
+
+
+def test_over_long_line_is_dropped_and_next_line_still_matches(tmp_path):
+    path = tmp_path / "console.log"
+    # Has the literal, so it'd be yielded if it were buffered whole; long
+    # enough that the carried part outgrows the cap whatever the chunking
+    append(path, MATCH_LINE + "x" * (2 * MAX_LINE_BYTES) + "\n" + MATCH_LINE + "\n")
+    reader = reader_of(path, chunk_size=4096)
+
+    lines = list(reader.read_lines())
+    reader.close()
+
+    assert lines == [MATCH_LINE]
+
+
+def test_truncated_file_is_read_again_from_the_top(tmp_path):
+    path = tmp_path / "console.log"
+    append(path, "[Client] An older session's line\n" * 4)
+    reader = reader_of(path, from_start=False)
+
+    path.write_bytes(MATCH_LINE.encode() + b"\n")
+    lines = list(reader.read_lines())
+    reader.close()
+
+    assert lines == [MATCH_LINE]
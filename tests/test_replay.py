@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+from lol.auto_pick import PICKABLE_CHAMPIONS, SESSION, LoLAutoPick
+from lol.event_dispatch import CoalescingEventManager
+from lol.lcu_frames import LCUEvent
+from lol.recording import EventRecorder, ReplayClock, replay
+
+CHAMPION_ID = 103
+# Recorded a day before the replay: the client's timer epochs are that old
+RECORDED_AT_MS = time.time() * 1000 - 24 * 3600 * 1000
+
+
+class Settings:
+    data = {
+        "auto_pick_enabled": True,
+        "auto_lock_enabled": True,
+        "default_champions": {"middle": {"primary": CHAMPION_ID, "secondary": None}},
+    }
+
+
+class Connector:
+    def __init__(self):
+        self.ws = CoalescingEventManager()
+
+
+def champ_select_session(champion_id=0, time_left_ms=1200, elapsed_ms=0):
+    """Our pick is in progress, with ``time_left_ms`` left ``elapsed_ms``
+    into the recording."""
+    return {
+        "gameId": 1,
+        "localPlayerCellId": 2,
+        "myTeam": [{"cellId": cell, "assignedPosition": "middle" if cell == 2 else "top"} for cell in range(5)],
+        "actions": [[{"id": 1, "actorCellId": 0, "championId": 1, "completed": True, "isInProgress": False,
+                      "type": "ban"}],
+                    [{"id": 3, "actorCellId": 2, "championId": champion_id, "completed": False,
+                      "isInProgress": True, "type": "pick"}]],
+        "timer": {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": time_left_ms, "isInfinite": False,
+                  "internalNowInEpochMs": RECORDED_AT_MS + elapsed_ms},
+    }
+
+
+def record(path, events):
+    recorder = EventRecorder(path)
+    for event_type, uri, data in events:
+        recorder.record(LCUEvent(event_type, uri, data=data))
+    recorder.close()
+
+
+def test_replayed_champ_select_hovers_then_locks_from_the_cached_session(tmp_path):
+    path = tmp_path / "champ_select.jsonl.gz"
+    record(path, [
+        ("Create", PICKABLE_CHAMPIONS, [1, 2, CHAMPION_ID]),
+        ("Create", SESSION, champ_select_session()),
+        # The hover came back; the lock is due (margin > time left)
+        ("Update", SESSION, champ_select_session(CHAMPION_ID, time_left_ms=1100, elapsed_ms=100)),
+    ])
+
+    connector = Connector()
+    LoLAutoPick(Settings()).register_ws_handlers(connector)
+    connection = asyncio.run(replay(path, connector.ws, settle_sec=1.0))
+
+    # No GET: the pickable list came with the recording, and the lock goes
+    # out from the cached session as the recorded timer isn't stale
+    assert [(method, endpoint, data) for _, method, endpoint, data in connection.requests] == [
+        ("PATCH", f"{SESSION}/actions/3", {"championId": CHAMPION_ID, "completed": False}),
+        ("PATCH", f"{SESSION}/actions/3", {"championId": CHAMPION_ID, "completed": True}),
+    ]
+
+
+def test_replay_skips_hover_of_champion_not_pickable(tmp_path):
+    path = tmp_path / "champ_select.jsonl.gz"
+    record(path, [
+        ("Create", PICKABLE_CHAMPIONS, [1, 2]),
+        ("Create", SESSION, champ_select_session()),
+    ])
+
+    connector = Connector()
+    LoLAutoPick(Settings()).register_ws_handlers(connector)
+    connection = asyncio.run(replay(path, connector.ws))
+
+    assert connection.requests == []
+
+
+def test_replay_on_replay_clock_locks_when_due_after_the_last_event(tmp_path):
+    path = tmp_path / "champ_select.jsonl.gz"
+    record(path, [
+        ("Create", PICKABLE_CHAMPIONS, [1, 2, CHAMPION_ID]),
+        ("Create", SESSION, champ_select_session()),
+        # The hover came back with 4 s left: the lock is due after the
+        # recording ends
+        ("Update", SESSION, champ_select_session(CHAMPION_ID, time_left_ms=4000, elapsed_ms=100)),
+    ])
+
+    clock = ReplayClock()
+    connector = Connector()
+    auto_pick = LoLAutoPick(Settings(), clock=clock)
+    auto_pick.register_ws_handlers(connector)
+    locked_at_ms = []
+    lock = auto_pick.lock_scheduler._lock
+
+    async def timed_lock():
+        locked_at_ms.append(clock.now_ms())
+        return await lock()
+
+    auto_pick.lock_scheduler._lock = timed_lock
+    connection = asyncio.run(replay(path, connector.ws, clock=clock))
+
+    assert [(method, endpoint, data) for _, method, endpoint, data in connection.requests] == [
+        ("PATCH", f"{SESSION}/actions/3", {"championId": CHAMPION_ID, "completed": False}),
+        ("PATCH", f"{SESSION}/actions/3", {"championId": CHAMPION_ID, "completed": True}),
+    ]
+    # Past the last event, ahead of the recorded end of the phase
+    assert RECORDED_AT_MS + 100 < locked_at_ms[0] < RECORDED_AT_MS + 100 + 4000
@@ -0,0 +1,34 @@
+from cs2 import vdf
+from cs2.localconfig_index import LOCALCONFIG_APP_PATH
+
+
+def localconfig(apps: bytes) -> bytes:
+    """A localconfig.vdf whose ``apps`` block holds ``apps``, tab-indented
+    as Steam writes it."""
+    return (b'"UserLocalConfigStore"\n{\n\t"Software"\n\t{\n\t\t"Valve"\n\t\t{\n\t\t\t"Steam"\n\t\t\t{\n'
+            b'\t\t\t\t"apps"\n\t\t\t\t{\n' + apps + b'\t\t\t\t}\n\t\t\t}\n\t\t}\n\t}\n}\n')
+
+
+def nested(depth: int) -> bytes:
+    """A block ``depth`` levels deep."""
+    return b'{ "k" ' * depth + b'"v"' + b' }' * depth
+
+
+def test_find_returns_none_for_missing_app():
+    data = localconfig(b'\t\t\t\t\t"570"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LaunchOptions"\t\t"-novid"\n\t\t\t\t\t}\n')
+
+    assert vdf.find(data, LOCALCONFIG_APP_PATH) is None
+
+
+def test_find_falls_back_to_full_parse_past_nested_block_limit():
+    deep = nested(12)
+    data = localconfig(b'\t\t\t\t\t"570" ' + deep + b'\n'
+                       b'\t\t\t\t\t"730"\n\t\t\t\t\t{\n\t\t\t\t\t\t"LaunchOptions"\t\t"-novid"\n\t\t\t\t\t}\n')
+    # The sibling is too deep for the one-match skip
+    assert vdf._BLOCK_RE.match(data, data.index(deep)) is None
+
+    app = vdf.find(data, LOCALCONFIG_APP_PATH)
+
+    assert app.is_block
+    assert app.get("LaunchOptions").value == "-novid"
+    assert data[app.value_start:app.value_end].startswith(b"{") and data[app.value_end - 1:app.value_end] == b"}"